@@ -4,22 +4,26 @@ Provides:
 - Mock Ollama (httpx_mock)
 - In-memory SQLite database
 - Ephemeral ChromaDB (temporary directory)
+- Deterministic hash embedder (no model load)
 - Mock OBD2 service
-- FastAPI test client
+- Async FastAPI test client (httpx + ASGITransport)
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import tempfile
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, NonCallableMock
 
+import numpy as np
 import pytest
 import pytest_asyncio
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 # ---------------------------------------------------------------------------
 # Environment setup (before importing backend modules)
@@ -38,8 +42,18 @@ os.environ["DEBUG"] = "true"
 
 @pytest_asyncio.fixture
 async def db_engine():
-    """Create an in-memory async SQLite engine."""
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
+    """Create an in-memory async SQLite engine.
+
+    ``StaticPool`` keeps a single connection so every session sees the same
+    in-memory database (each new SQLite connection would otherwise get its
+    own, empty one).
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+        echo=False,
+    )
     from backend.models.database import Base
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -66,9 +80,42 @@ def chromadb_dir():
         yield Path(tmpdir)
 
 
+class HashEmbedder:
+    """Deterministic stand-in for SentenceTransformer.
+
+    Maps each text to a fixed unit vector seeded from its SHA-256 digest, so
+    retrieval round-trips without loading a model.  Identical texts embed
+    identically; anything else is effectively random.
+    """
+
+    dim = 384
+
+    def encode(self, texts, **kwargs):
+        rows = [
+            np.random.default_rng(
+                int.from_bytes(hashlib.sha256(t.encode()).digest()[:8], "little")
+            ).standard_normal(self.dim)
+            for t in texts
+        ]
+        arr = np.stack(rows).astype(np.float32)
+        return arr / np.linalg.norm(arr, axis=1, keepdims=True)
+
+
 @pytest.fixture
-def rag_service(chromadb_dir):
-    """RAG service with ephemeral ChromaDB."""
+def fast_rag_service(chromadb_dir):
+    """RAG service with ephemeral ChromaDB and the hash embedder."""
+    from backend.services.rag import RAGService
+    svc = RAGService(persist_dir=chromadb_dir)
+    svc._embedder = HashEmbedder()
+    return svc
+
+
+@pytest.fixture
+def real_rag_service(chromadb_dir):
+    """RAG service with ephemeral ChromaDB and the real embedding model.
+
+    Only for tests that check semantic relevance.
+    """
     from backend.services.rag import RAGService
     svc = RAGService(persist_dir=chromadb_dir)
     return svc
@@ -78,7 +125,7 @@ def rag_service(chromadb_dir):
 # Mock Ollama
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ollama_response():
     """Standard mock Ollama response."""
     return {
@@ -88,9 +135,9 @@ def mock_ollama_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_chat_service(mock_ollama_response):
-    """ChatService with mocked HTTP client."""
+    """ChatService with mocked HTTP client (stateless, shared per session)."""
     from backend.services.chat import ChatService, LLMResponse
 
     svc = ChatService()
@@ -113,9 +160,9 @@ def mock_chat_service(mock_ollama_response):
 # Mock OBD2
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_obd2_service():
-    """OBD2 service that doesn't require real hardware."""
+    """OBD2 service that doesn't require real hardware (shared per session)."""
     from backend.services.obd2 import OBD2Service, SensorSnapshot, DTCInfo
     from datetime import datetime
 
@@ -137,6 +184,25 @@ def mock_obd2_service():
     return svc
 
 
+@pytest.fixture(autouse=True)
+def _reset_service_mocks(request):
+    """Clear recorded calls on the session-scoped service mocks after each test.
+
+    Only touches mocks the test actually pulled in, so tests that never use
+    the backend don't pay for building them.
+    """
+    services = [
+        request.getfixturevalue(name)
+        for name in ("mock_chat_service", "mock_obd2_service")
+        if name in request.fixturenames
+    ]
+    yield
+    for svc in services:
+        for attr in vars(svc).values():
+            if isinstance(attr, NonCallableMock):
+                attr.reset_mock()
+
+
 # ---------------------------------------------------------------------------
 # Vehicle service fixture
 # ---------------------------------------------------------------------------
@@ -154,34 +220,38 @@ def vehicle_service():
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def app(mock_chat_service, rag_service, mock_obd2_service, vehicle_service):
+def app(monkeypatch, mock_chat_service, fast_rag_service, mock_obd2_service, vehicle_service):
     """FastAPI app with mocked services."""
-    with patch("backend.services.chat_service", mock_chat_service), \
-         patch("backend.services.rag_service", rag_service), \
-         patch("backend.services.obd2_service", mock_obd2_service), \
-         patch("backend.services.vehicle_service", vehicle_service):
-        from backend.main import app as fastapi_app
-        yield fastapi_app
+    import backend.services as services
 
+    monkeypatch.setattr(services, "chat_service", mock_chat_service)
+    monkeypatch.setattr(services, "rag_service", fast_rag_service)
+    monkeypatch.setattr(services, "obd2_service", mock_obd2_service)
+    monkeypatch.setattr(services, "vehicle_service", vehicle_service)
 
-@pytest.fixture
-def client(app):
-    """Synchronous test client for endpoint tests.
+    from backend.main import app as fastapi_app
+    return fastapi_app
 
-    Uses context manager to ensure lifespan events (init_db, etc.) run.
-    Tables are dropped and recreated for each test to ensure isolation.
+
+@pytest_asyncio.fixture
+async def aclient(app):
+    """Async test client for endpoint tests.
+
+    Talks to the app in-process over ``ASGITransport`` so requests, the DB
+    and the RAG service all share the test's event loop.  The transport does
+    not emit lifespan events, so the lifespan (init_db, etc.) is entered
+    explicitly.  Tables are dropped and recreated for each test to ensure
+    isolation.
     """
     from backend.models.database import Base
     from backend.models.session import engine
 
-    import asyncio
-
-    async def _reset_tables():
+    async with app.router.lifespan_context(app):
+        # Reset tables after lifespan has run, before yielding to the test
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
 
-    with TestClient(app) as c:
-        # Reset tables after lifespan has run, before yielding to the test
-        asyncio.get_event_loop().run_until_complete(_reset_tables())
-        yield c
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
@@ -1,15 +1,19 @@
 """Tests for the chat API endpoints."""
 
-import json
+import orjson
 import pytest
 
+# Just over the 4000-char message limit
+_LONG_MSG = "x" * 4001
+
 
 class TestChatEndpoints:
     """Test /api/v1/chat/* endpoints."""
 
-    def test_send_message(self, client):
+    @pytest.mark.asyncio
+    async def test_send_message(self, aclient):
         """POST /chat/message returns a response with sources."""
-        resp = client.post(
+        resp = await aclient.post(
             "/api/v1/chat/message",
             json={"message": "What is the oil capacity?"}
         )
@@ -21,56 +25,69 @@ class TestChatEndpoints:
         assert "model" in data
         assert len(data["response"]) > 0
 
-    def test_send_message_empty_rejected(self, client):
+    @pytest.mark.asyncio
+    async def test_send_message_empty_rejected(self, aclient):
         """Empty messages should be rejected by validation."""
-        resp = client.post(
+        resp = await aclient.post(
             "/api/v1/chat/message",
             json={"message": ""}
         )
         assert resp.status_code == 422
 
-    def test_send_message_too_long_rejected(self, client):
+    @pytest.mark.asyncio
+    async def test_send_message_too_long_rejected(self, aclient):
         """Messages over 4000 chars should be rejected."""
-        resp = client.post(
+        resp = await aclient.post(
             "/api/v1/chat/message",
-            json={"message": "x" * 4001}
+            json={"message": _LONG_MSG}
         )
         assert resp.status_code == 422
 
-    def test_send_message_with_vehicle_id(self, client):
+    @pytest.mark.asyncio
+    async def test_send_message_with_vehicle_id(self, aclient):
         """Messages can optionally include a vehicle_id."""
-        resp = client.post(
+        resp = await aclient.post(
             "/api/v1/chat/message",
             json={"message": "What oil do I need?", "vehicle_id": None}
         )
         assert resp.status_code == 200
 
-    def test_stream_endpoint(self, client):
+    @pytest.mark.asyncio
+    async def test_stream_endpoint(self, aclient):
         """POST /chat/message/stream returns SSE events."""
-        resp = client.post(
+        async with aclient.stream(
+            "POST",
             "/api/v1/chat/message/stream",
             json={"message": "What is the oil capacity?"},
-        )
-        assert resp.status_code == 200
-        assert "text/event-stream" in resp.headers["content-type"]
+        ) as resp:
+            assert resp.status_code == 200
+            assert "text/event-stream" in resp.headers["content-type"]
 
-        # Parse SSE events
-        events = []
-        for line in resp.text.split("\n"):
-            if line.startswith("data: "):
-                events.append(json.loads(line[6:]))
+            # Parse SSE events from raw bytes as they arrive (orjson takes
+            # bytes, so nothing is decoded); stop once we have enough
+            events = []
+            pending = b""
+            async for chunk in resp.aiter_bytes():
+                *lines, pending = (pending + chunk).split(b"\n")
+                events.extend(
+                    orjson.loads(line[6:]) for line in lines if line.startswith(b"data: ")
+                )
+                if len(events) >= 2:
+                    break
 
         # Should have at least one token event and a sources event
         assert len(events) >= 2
 
-    def test_get_history_empty(self, client):
+    @pytest.mark.asyncio
+    async def test_get_history_empty(self, aclient):
         """GET /chat/history returns empty list initially."""
-        resp = client.get("/api/v1/chat/history")
+        resp = await aclient.get("/api/v1/chat/history")
         assert resp.status_code == 200
         assert resp.json() == []
 
-    def test_delete_history(self, client):
+    @pytest.mark.asyncio
+    async def test_delete_history(self, aclient):
         """DELETE /chat/history succeeds."""
-        resp = client.delete("/api/v1/chat/history")
+        resp = await aclient.delete("/api/v1/chat/history")
         assert resp.status_code == 200
         assert resp.json()["status"] == "ok"
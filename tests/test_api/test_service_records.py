@@ -7,8 +7,9 @@ from datetime import datetime
 class TestServiceRecordEndpoints:
     """Test /api/v1/service/* endpoints."""
 
-    def test_get_maintenance_schedule(self, client):
-        resp = client.get("/api/v1/service/schedules/fzj80")
+    @pytest.mark.asyncio
+    async def test_get_maintenance_schedule(self, aclient):
+        resp = await aclient.get("/api/v1/service/schedules/fzj80")
         assert resp.status_code == 200
         data = resp.json()
         assert data["vehicle_type"] == "fzj80"
@@ -17,13 +18,15 @@ class TestServiceRecordEndpoints:
         types = [s["service_type"] for s in data["schedules"]]
         assert "oil_change" in types
 
-    def test_get_schedule_invalid_vehicle(self, client):
-        resp = client.get("/api/v1/service/schedules/nonexistent")
+    @pytest.mark.asyncio
+    async def test_get_schedule_invalid_vehicle(self, aclient):
+        resp = await aclient.get("/api/v1/service/schedules/nonexistent")
         assert resp.status_code == 404
 
-    def test_service_record_lifecycle(self, client):
+    @pytest.mark.asyncio
+    async def test_service_record_lifecycle(self, aclient):
         # Create a vehicle first
-        v_resp = client.post("/api/v1/vehicles/", json={
+        v_resp = await aclient.post("/api/v1/vehicles/", json={
             "vehicle_type": "fzj80",
             "nickname": "Service Test",
             "year": 1996,
@@ -32,7 +35,7 @@ class TestServiceRecordEndpoints:
         vehicle_id = v_resp.json()["id"]
 
         # Create service record
-        resp = client.post(f"/api/v1/service/{vehicle_id}/records", json={
+        resp = await aclient.post(f"/api/v1/service/{vehicle_id}/records", json={
             "service_date": "2024-01-15T10:00:00",
             "service_type": "oil_change",
             "mileage": 185000,
@@ -44,16 +47,16 @@ class TestServiceRecordEndpoints:
         record_id = resp.json()["id"]
 
         # List records
-        resp = client.get(f"/api/v1/service/{vehicle_id}/records")
+        resp = await aclient.get(f"/api/v1/service/{vehicle_id}/records")
         assert resp.status_code == 200
         records = resp.json()
         assert len(records) == 1
         assert records[0]["service_type"] == "oil_change"
 
         # Delete record
-        resp = client.delete(f"/api/v1/service/{vehicle_id}/records/{record_id}")
+        resp = await aclient.delete(f"/api/v1/service/{vehicle_id}/records/{record_id}")
         assert resp.status_code == 200
 
         # Verify deleted
-        resp = client.get(f"/api/v1/service/{vehicle_id}/records")
+        resp = await aclient.get(f"/api/v1/service/{vehicle_id}/records")
         assert resp.json() == []
@@ -6,20 +6,23 @@ import pytest
 class TestVehicleEndpoints:
     """Test /api/v1/vehicles/* endpoints."""
 
-    def test_list_vehicles_empty(self, client):
-        resp = client.get("/api/v1/vehicles/")
+    @pytest.mark.asyncio
+    async def test_list_vehicles_empty(self, aclient):
+        resp = await aclient.get("/api/v1/vehicles/")
         assert resp.status_code == 200
         assert resp.json() == []
 
-    def test_list_vehicle_types(self, client):
-        resp = client.get("/api/v1/vehicles/types")
+    @pytest.mark.asyncio
+    async def test_list_vehicle_types(self, aclient):
+        resp = await aclient.get("/api/v1/vehicles/types")
         assert resp.status_code == 200
         types = resp.json()
         assert len(types) >= 1
         assert any(v["type"] == "fzj80" for v in types)
 
-    def test_create_vehicle(self, client):
-        resp = client.post("/api/v1/vehicles/", json={
+    @pytest.mark.asyncio
+    async def test_create_vehicle(self, aclient):
+        resp = await aclient.post("/api/v1/vehicles/", json={
             "vehicle_type": "fzj80",
             "nickname": "Big Red",
             "year": 1996,
@@ -32,15 +35,17 @@ class TestVehicleEndpoints:
         assert data["year"] == 1996
         assert data["id"] is not None
 
-    def test_create_vehicle_invalid_type(self, client):
-        resp = client.post("/api/v1/vehicles/", json={
+    @pytest.mark.asyncio
+    async def test_create_vehicle_invalid_type(self, aclient):
+        resp = await aclient.post("/api/v1/vehicles/", json={
             "vehicle_type": "nonexistent",
         })
         assert resp.status_code == 400
 
-    def test_vehicle_crud_lifecycle(self, client):
+    @pytest.mark.asyncio
+    async def test_vehicle_crud_lifecycle(self, aclient):
         # Create
-        resp = client.post("/api/v1/vehicles/", json={
+        resp = await aclient.post("/api/v1/vehicles/", json={
             "vehicle_type": "fzj80",
             "nickname": "Test Cruiser",
             "year": 1995,
@@ -49,12 +54,12 @@ class TestVehicleEndpoints:
         vehicle_id = resp.json()["id"]
 
         # Get
-        resp = client.get(f"/api/v1/vehicles/{vehicle_id}")
+        resp = await aclient.get(f"/api/v1/vehicles/{vehicle_id}")
         assert resp.status_code == 200
         assert resp.json()["nickname"] == "Test Cruiser"
 
         # Update
-        resp = client.put(f"/api/v1/vehicles/{vehicle_id}", json={
+        resp = await aclient.put(f"/api/v1/vehicles/{vehicle_id}", json={
             "nickname": "Updated Cruiser",
             "current_mileage": 200000,
         })
@@ -62,9 +67,9 @@ class TestVehicleEndpoints:
         assert resp.json()["nickname"] == "Updated Cruiser"
 
         # Delete
-        resp = client.delete(f"/api/v1/vehicles/{vehicle_id}")
+        resp = await aclient.delete(f"/api/v1/vehicles/{vehicle_id}")
         assert resp.status_code == 200
 
         # Verify deleted
-        resp = client.get(f"/api/v1/vehicles/{vehicle_id}")
+        resp = await aclient.get(f"/api/v1/vehicles/{vehicle_id}")
         assert resp.status_code == 404
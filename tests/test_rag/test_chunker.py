@@ -3,6 +3,10 @@
 import pytest
 from tools.kb_builder.chunker import SmartChunker
 
+_GENERAL_TEXT = "The Toyota Land Cruiser FZJ80 is a legendary off-road vehicle. " * 20
+_REPEATED_SENTENCES = "First sentence here. " * 30 + "Second sentence here. " * 30
+_PARTS_TEXT = "Part 90915-YZZB6: Oil filter for 1FZ-FE engine. " * 15
+
 
 class TestSmartChunker:
     """Test all chunking strategies."""
@@ -68,7 +72,7 @@ Maximum warpage spec is 0.05mm. Get it resurfaced if needed.""",
         doc = {
             "source": "other",
             "source_id": "misc-1",
-            "content": "The Toyota Land Cruiser FZJ80 is a legendary off-road vehicle. " * 20,
+            "content": _GENERAL_TEXT,
             "category": "general",
         }
         chunks = chunker.chunk_document(doc)
@@ -79,7 +83,7 @@ Maximum warpage spec is 0.05mm. Get it resurfaced if needed.""",
         doc = {
             "source": "fsm",
             "source_id": "test",
-            "content": "First sentence here. " * 30 + "Second sentence here. " * 30,
+            "content": _REPEATED_SENTENCES,
             "category": "engine",
         }
         chunks = chunker.chunk_document(doc)
@@ -90,7 +94,7 @@ Maximum warpage spec is 0.05mm. Get it resurfaced if needed.""",
         doc = {
             "source": "parts",
             "source_id": "catalog-1",
-            "content": "Part 90915-YZZB6: Oil filter for 1FZ-FE engine. " * 15,
+            "content": _PARTS_TEXT,
             "category": "parts",
         }
         chunks = chunker.chunk_document(doc)
@@ -1,13 +1,18 @@
 """Tests for the forum post normalizer."""
 
+import hashlib
 import json
 import pytest
 from pathlib import Path
 from tools.processors.forum import (
     normalize_thread, compute_quality_score, map_category,
-    deduplicate, _clean_post_content,
+    deduplicate, _clean_post_content, process_forum_directory,
 )
 
+_SHORT_OP = "x" * 60
+_DUP_CONTENT = "Same content here" * 10
+_OTHER_CONTENT = "Totally different stuff" * 10
+
 
 @pytest.fixture
 def sample_thread():
@@ -68,13 +73,20 @@ class TestForumProcessor:
 
     def test_quality_score_low_engagement(self):
         thread = {
-            "posts": [{"content": "x" * 60, "votes": 0, "is_op": True}],
+            "posts": [{"content": _SHORT_OP, "votes": 0, "is_op": True}],
             "views": 10,
             "replies": 0,
         }
         score = compute_quality_score(thread)
         assert score < 0.3
 
+    def test_quality_score_null_metrics_count_as_zero(self, sample_thread):
+        nulls = {"posts": [{"content": _SHORT_OP, "votes": None}], "views": None, "replies": None}
+        zeros = {"posts": [{"content": _SHORT_OP, "votes": 0}], "views": 0, "replies": 0}
+        assert compute_quality_score(nulls) == compute_quality_score(zeros)
+        assert compute_quality_score({**sample_thread, "views": None, "replies": None}) == \
+            compute_quality_score({**sample_thread, "views": 0, "replies": 0})
+
     def test_category_mapping(self):
         assert map_category("80-Series Tech") == "forum_troubleshoot"
         assert map_category("80-Series Build Threads") == "forum_mods"
@@ -90,13 +102,23 @@ class TestForumProcessor:
 
     def test_deduplicate(self):
         docs = [
-            {"title": "Test", "content": "Same content here" * 10, "source_id": "1"},
-            {"title": "Test", "content": "Same content here" * 10, "source_id": "2"},
-            {"title": "Different", "content": "Totally different stuff" * 10, "source_id": "3"},
+            {"title": "Test", "content": _DUP_CONTENT, "source_id": "1"},
+            {"title": "Test", "content": _DUP_CONTENT, "source_id": "2"},
+            {"title": "Different", "content": _OTHER_CONTENT, "source_id": "3"},
         ]
         unique = deduplicate(docs)
         assert len(unique) == 2
 
+    def test_deduplicate_near_duplicates(self):
+        pytest.importorskip("datasketch")
+        edited = _DUP_CONTENT.replace("Same content", "Same contents", 1)
+        docs = [
+            {"title": "Test", "content": _OTHER_CONTENT + _DUP_CONTENT, "source_id": "1"},
+            {"title": "Repost", "content": _OTHER_CONTENT + edited, "source_id": "2"},
+        ]
+        unique = deduplicate(docs)
+        assert [d["source_id"] for d in unique] == ["1"]
+
     def test_responses_sorted_by_votes(self, sample_thread):
         doc = normalize_thread(sample_thread)
         # The highest-voted response should appear first
@@ -106,3 +128,58 @@ class TestForumProcessor:
         idx_torque = doc["content"].index("29 ft-lbs")
         idx_warpage = doc["content"].index("warpage")
         assert idx_torque < idx_warpage
+
+    def test_process_directory_parallel_matches_serial(self, sample_thread, tmp_path):
+        in_dir = tmp_path / "threads"
+        in_dir.mkdir()
+        for i in range(4):
+            # Distinct per-thread text so near-duplicate detection keeps all four
+            extra = " ".join(hashlib.sha1(f"{i}-{j}".encode()).hexdigest() for j in range(40))
+            posts = [dict(p, content=f"{p['content']} {extra}") for p in sample_thread["posts"]]
+            thread = dict(sample_thread, thread_id=str(i), title=f"Thread {i}", posts=posts)
+            (in_dir / f"t{i}.json").write_text(json.dumps(thread))
+        (in_dir / "broken.json").write_text("{not json")
+
+        serial = process_forum_directory(in_dir, tmp_path / "serial.jsonl", workers=1)
+        parallel = process_forum_directory(in_dir, tmp_path / "parallel.jsonl", workers=2)
+
+        assert len(serial) == 4
+        assert parallel == serial
+        lines = (tmp_path / "parallel.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == serial
+
+    def test_process_directory_cache_skips_unchanged(self, sample_thread, tmp_path, monkeypatch):
+        import tools.processors.forum as forum
+
+        in_dir = tmp_path / "threads"
+        in_dir.mkdir()
+        (in_dir / "t0.json").write_text(json.dumps(sample_thread))
+        cache = tmp_path / "cache.sqlite"
+
+        first = process_forum_directory(in_dir, tmp_path / "a.jsonl", workers=1, cache_path=cache)
+
+        calls = []
+        real = forum._process_forum_file_safe
+        monkeypatch.setattr(forum, "_process_forum_file_safe", lambda *a: calls.append(a) or real(*a))
+        second = process_forum_directory(in_dir, tmp_path / "b.jsonl", workers=1, cache_path=cache)
+
+        assert second == first
+        assert calls == []
+
+    def test_process_directory_cache_invalidated_by_code_change(self, sample_thread, tmp_path, monkeypatch):
+        import tools.processors.forum as forum
+
+        in_dir = tmp_path / "threads"
+        in_dir.mkdir()
+        (in_dir / "t0.json").write_text(json.dumps(sample_thread))
+        cache = tmp_path / "cache.sqlite"
+
+        process_forum_directory(in_dir, tmp_path / "a.jsonl", workers=1, cache_path=cache)
+
+        calls = []
+        real = forum._process_forum_file_safe
+        monkeypatch.setattr(forum, "_process_forum_file_safe", lambda *a: calls.append(a) or real(*a))
+        monkeypatch.setattr(forum, "_CODE_VERSION", "changed")
+        process_forum_directory(in_dir, tmp_path / "b.jsonl", workers=1, cache_path=cache)
+
+        assert len(calls) == 1
@@ -0,0 +1,39 @@
+"""Tests for IH8MUD content classification and tagging."""
+
+import pytest
+
+import tools.scrapers.ih8mud as ih8mud
+from tools.scrapers.ih8mud import IH8MUDScraper
+
+_TEXTS = [
+    "Roof rack install on my FZJ80",
+    "Power steering rack leaking, help",
+    "Installed a 3 inch lift kit and winch bumper",
+    "1FZ-FE head gasket procedure, step by step",
+    "Oil change interval for the 80 series",
+    "Part number for the OEM door seal? Need to replace it",
+    "Nothing relevant here at all",
+    "",
+]
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return IH8MUDScraper(output_dir=tmp_path)
+
+
+@pytest.mark.parametrize("text", _TEXTS)
+def test_automaton_matches_substring_fallback(scraper, monkeypatch, text):
+    pytest.importorskip("ahocorasick")
+    category = scraper._classify_content(text)
+    tags = scraper._extract_tags(text)
+
+    monkeypatch.setattr(ih8mud, "_CATEGORY_AUTOMATON", None)
+    monkeypatch.setattr(ih8mud, "_TAG_AUTOMATON", None)
+    assert scraper._classify_content(text) == category
+    assert scraper._extract_tags(text) == tags
+
+
+def test_shared_keyword_takes_first_category(scraper):
+    # "rack" is both a chassis and a forum_mods keyword; chassis comes first
+    assert scraper._classify_content("roof rack") == "chassis"
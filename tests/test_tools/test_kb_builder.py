@@ -0,0 +1,53 @@
+"""Tests for the ChromaDB knowledge base builder."""
+
+import json
+
+import pytest
+from tools.kb_builder.builder import KnowledgeBaseBuilder
+
+from tests.conftest import HashEmbedder
+
+
+@pytest.fixture
+def l2_collection(tmp_path):
+    """A persisted collection created without metadata (ChromaDB's l2 default)."""
+    builder = KnowledgeBaseBuilder(tmp_path)
+    collection = builder.client.create_collection("fzj80_engine")
+    collection.add(ids=["keep"], documents=["1FZ-FE oil capacity"], embeddings=[[0.1, 0.2, 0.3]])
+    return tmp_path
+
+
+class TestCreateCollections:
+
+    def test_space_mismatch_keeps_existing_collection(self, l2_collection):
+        builder = KnowledgeBaseBuilder(l2_collection)
+        with pytest.raises(ValueError, match="hnsw:space"):
+            builder.create_collections("fzj80")
+        assert builder.client.get_collection("fzj80_engine").get(ids=["keep"])["ids"] == ["keep"]
+
+    def test_rebuild_recreates_collection(self, l2_collection):
+        builder = KnowledgeBaseBuilder(l2_collection, rebuild=True)
+        collections = builder.create_collections("fzj80")
+        assert collections["engine"].metadata["hnsw:space"] == "cosine"
+        assert collections["engine"].count() == 0
+
+
+class TestAddDocumentsFromFile:
+
+    def test_repeated_document_is_stored_once(self, tmp_path):
+        doc = {
+            "source": "fsm",
+            "source_id": "lu-3",
+            "category": "engine",
+            "title": "Lubrication",
+            "content": "The 1FZ-FE engine oil capacity is 6.8 quarts with filter. " * 8,
+        }
+        jsonl = tmp_path / "fsm.jsonl"
+        jsonl.write_text(json.dumps(doc) + "\n" + json.dumps(doc) + "\n")
+
+        builder = KnowledgeBaseBuilder(tmp_path / "chromadb")
+        builder._embedder = HashEmbedder()
+        added = builder.add_documents_from_file("fzj80", jsonl)
+
+        engine = builder.client.get_collection("fzj80_engine")
+        assert added == engine.count() > 0
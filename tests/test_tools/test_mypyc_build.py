@@ -0,0 +1,46 @@
+"""Tests for the optional mypyc build of the processors."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+_IMPORT_CHECK = """
+import importlib.machinery
+import tools.processors.fsm as fsm
+import tools.processors.web_article as web_article
+
+for mod in (fsm, web_article):
+    assert mod.__file__.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)), mod.__file__
+
+section = fsm.FSMSection("LUBRICATION", "engine", [fsm.FSMPage(1, "Oil"), fsm.FSMPage(2, " ")])
+assert section.text == "Oil"
+assert section.text is section.text
+assert fsm.classify_section("ENGINE MECHANICAL") == "engine"
+"""
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RIGSHERPA_TEST_MYPYC"),
+    reason="full C compile; set RIGSHERPA_TEST_MYPYC=1 to run",
+)
+@pytest.mark.skipif(shutil.which("cc") is None, reason="no C compiler")
+def test_compiled_processors_import(tmp_path):
+    pytest.importorskip("mypyc")
+    shutil.copytree(
+        PROJECT_ROOT / "tools", tmp_path / "tools",
+        ignore=shutil.ignore_patterns("__pycache__", "*.so"),
+    )
+    shutil.copy(PROJECT_ROOT / "pyproject.toml", tmp_path)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(tmp_path), *sys.path])}
+
+    subprocess.run(
+        [sys.executable, "tools/mypyc_build.py", "build_ext", "--inplace"],
+        cwd=tmp_path, env=env, check=True, capture_output=True,
+    )
+    subprocess.run([sys.executable, "-c", _IMPORT_CHECK], cwd=tmp_path, env=env, check=True)
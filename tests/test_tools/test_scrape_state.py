@@ -0,0 +1,68 @@
+"""Tests for the scrape state manager's thread index."""
+
+import json
+
+import pytest
+from tools.scrapers.state import ScrapeStateManager
+
+
+def _thread(thread_id, replies=0, views=0, **extra):
+    return {
+        "thread_id": thread_id,
+        "title": f"Thread {thread_id}",
+        "url": f"https://forum.ih8mud.com/threads/t.{thread_id}/",
+        "replies": replies,
+        "views": views,
+        "last_activity": "",
+        "forum": "80_series_tech",
+        **extra,
+    }
+
+
+@pytest.fixture
+def state(tmp_path):
+    with ScrapeStateManager(tmp_path / "scrape_state.db") as sm:
+        yield sm
+
+
+class TestThreadIndex:
+
+    def test_add_threads_keeps_first_entry(self, state):
+        state.add_threads([_thread("1", replies=5)])
+        state.add_threads([_thread("1", replies=50), _thread("2")])
+        assert state.thread_count() == 2
+        pending = {t["thread_id"]: t for t in state.pending_threads("ih8mud_content")}
+        assert pending["1"]["replies"] == 5
+
+    def test_missing_counts_default_to_zero(self, state):
+        legacy = _thread("1")
+        del legacy["replies"], legacy["views"]
+        state.add_threads([legacy, _thread("2", views=None)])
+        pending = state.pending_threads("ih8mud_content")
+        assert [(t["replies"], t["views"]) for t in pending] == [(0, 0), (0, 0)]
+
+    def test_pending_threads_skips_done_and_orders_by_engagement(self, state):
+        state.add_threads([
+            _thread("quiet"),
+            _thread("busy", replies=100),
+            _thread("viewed", views=1000),
+            _thread("done", replies=500),
+            _thread(""),
+        ])
+        state.mark_item_done("ih8mud_content", "done")
+        pending = state.pending_threads("ih8mud_content")
+        assert [t["thread_id"] for t in pending] == ["busy", "viewed", "quiet"]
+
+    def test_import_thread_index_streams_legacy_jsonl(self, state, tmp_path):
+        legacy = _thread("3")
+        del legacy["replies"]
+        index = tmp_path / "thread_index.jsonl"
+        index.write_text(
+            "\n".join(json.dumps(t) for t in [_thread("1", replies=2), _thread("2"), _thread("1")])
+            + "\n\n" + json.dumps(legacy) + "\n"
+        )
+        assert state.import_thread_index(index, batch_size=2) == 4
+        assert state.thread_count() == 3
+        pending = state.pending_threads("ih8mud_content")
+        assert [t["thread_id"] for t in pending] == ["1", "2", "3"]
+        assert pending[2]["replies"] == 0
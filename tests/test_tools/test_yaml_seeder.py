@@ -2,9 +2,17 @@
 
 import pytest
 from pathlib import Path
+from tools.processors import yaml_seeder
 from tools.processors.yaml_seeder import seed_from_yaml
 
 
+@pytest.fixture(autouse=True)
+def yaml_cache_dir(tmp_path, monkeypatch):
+    """Keep the parsed-YAML cache out of the source tree."""
+    monkeypatch.setattr(yaml_seeder, "YAML_CACHE_DIR", tmp_path / "yaml_cache")
+    return tmp_path / "yaml_cache"
+
+
 @pytest.fixture
 def fzj80_yaml():
     return Path(__file__).parent.parent.parent / "config" / "vehicles" / "fzj80.yaml"
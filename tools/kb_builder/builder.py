@@ -1,15 +1,33 @@
 """Knowledge base builder for RigSherpa."""
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional, Iterator
+import asyncio
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSONL parsing
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Metadata value types ChromaDB accepts; exact type() membership is a
+# single hash lookup, cheaper than isinstance() per key per chunk
+_SAFE_TYPES = frozenset({str, int, float, bool})
+
+# Dynamically INT8-quantized ONNX weights (VNNI kernels) — shipped in the
+# all-MiniLM-L6-v2 hub repo, or produced by export_quantized_onnx() below.
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
 
 @dataclass
 class Chunk:
@@ -29,6 +47,28 @@ class EmbeddedChunk:
     embedding: list[float]
 
 
+def _safe_meta(c: Chunk) -> dict:
+    """Chunk metadata filtered to ChromaDB-safe value types."""
+    raw = {"source": c.source, "source_id": c.source_id, "category": c.category, **c.metadata}
+    return {k: v for k, v in raw.items() if type(v) in _SAFE_TYPES}
+
+
+def _dedupe_ids(chunks: list[Chunk]) -> list[Chunk]:
+    """Drop chunks whose ID already appeared earlier in *chunks*.
+
+    A single collection.add() rejects repeated IDs outright, and pooled
+    documents can repeat one (the same source_id and text, or an FSM JSONL
+    appended to by a re-run). The first occurrence is kept.
+    """
+    first: dict[str, Chunk] = {}
+    for c in chunks:
+        first.setdefault(c.id, c)
+    if len(first) < len(chunks):
+        logger.warning(f"Skipping {len(chunks) - len(first)} chunks with duplicate IDs")
+        return list(first.values())
+    return chunks
+
+
 class KnowledgeBaseBuilder:
     """Build ChromaDB knowledge base from processed documents.
     
@@ -42,36 +82,236 @@ class KnowledgeBaseBuilder:
     def __init__(
         self,
         persist_dir: Path,
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        backend: str = "torch",
+        bf16: bool = False,
+        hnsw_space: str = "cosine",
+        rebuild: bool = False,
     ):
         """Initialize knowledge base builder.
         
         Args:
             persist_dir: Directory to persist ChromaDB
             embedding_model: Sentence transformer model name
+            backend: Embedding runtime — 'torch' (FP32, as RAGService embeds
+                queries) or, opt-in, 'onnx' (INT8-quantized ONNX Runtime,
+                faster but its vectors differ slightly from the runtime's;
+                falls back to torch if unavailable).  Recorded in the pack
+                manifest as embedding_backend
+            bf16: Opt-in: on the torch backend, optimize the model for BF16
+                with Intel Extension for PyTorch when it is installed.  Faster,
+                but RAGService embeds queries in FP32, so stored vectors drift
+                slightly from the query side.  Recorded in the pack manifest
+                as embedding_precision
+            hnsw_space: Collection distance — 'cosine', or 'ip' to store
+                L2-normalized embeddings and rank by raw inner product.
+            rebuild: Drop and recreate existing collections whose
+                distance space differs from *hnsw_space* (their data is
+                lost). Without it such collections raise ValueError.
         """
         self.persist_dir = Path(persist_dir)
         self.persist_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize ChromaDB with persistent storage
-        self.client = chromadb.PersistentClient(
-            path=str(self.persist_dir),
-            settings=Settings(anonymized_telemetry=False)
-        )
+        self._tune_sqlite()
+        self.client = self._open_client()
         
         # Initialize embedding model
         self.embedding_model_name = embedding_model
+        self.backend = backend
+        self.bf16 = bf16
+        self.hnsw_space = hnsw_space
+        self.rebuild = rebuild
         self._embedder = None
+        self._autocast_bf16 = False
+
+        # Collection handles by name, so repeated searches and per-file
+        # create_collections() calls skip the SQLite metadata lookup
+        self._collection_cache: dict[str, chromadb.Collection] = {}
+        # One lock per collection name: concurrent file loads share this
+        # builder, and only their embedding step should overlap
+        self._write_locks: dict[str, threading.Lock] = {}
+        # encode() isn't safe to call concurrently on one model (fast
+        # tokenizers raise "Already borrowed"), so file loads take turns
+        self._encode_lock = threading.Lock()
+        # Fan-out pool for multi-category search(), started on first use
+        self._query_pool: Optional[ThreadPoolExecutor] = None
+
+        # Per-instance LRU of query embeddings (a method-level lru_cache
+        # would be shared across builders and keep them alive)
+        self._embed_query = lru_cache(maxsize=1024)(self._encode_query)
+
+        # Largest single collection.add() the backend accepts
+        try:
+            self._max_add_batch = self.client.get_max_batch_size()
+        except AttributeError:  # chromadb < 0.4.23
+            self._max_add_batch = 1000
+
+    def _tune_sqlite(self):
+        """Put an existing ChromaDB SQLite store in WAL mode before opening it.
+
+        Must run before the PersistentClient connects: touching the file
+        from a second SQLite library while ChromaDB holds it open corrupts
+        its locks. journal_mode is persisted in the file, so ChromaDB's own
+        connections pick it up; per-connection pragmas (synchronous,
+        cache_size) can't be set from here.
+        """
+        import sqlite3
+
+        db_path = self.persist_dir / "chroma.sqlite3"
+        if not db_path.exists():
+            return
+        try:
+            con = sqlite3.connect(db_path)
+            try:
+                con.execute("PRAGMA journal_mode=WAL")
+            finally:
+                con.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not tune {db_path}: {e}")
+
+    def _open_client(self) -> chromadb.ClientAPI:
+        """Open the persistent ChromaDB client for persist_dir."""
+        return chromadb.PersistentClient(
+            path=str(self.persist_dir),
+            settings=Settings(anonymized_telemetry=False)
+        )
+
+    def close(self):
+        """Release the ChromaDB client and stop the search thread pool."""
+        self._release_client()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _release_client(self):
+        """Close the ChromaDB client so nothing holds chroma.sqlite3 open.
+
+        Also stops the search pool; search() restarts it if the client is
+        reopened.
+        """
+        if self._query_pool is not None:
+            self._query_pool.shutdown()
+            self._query_pool = None
+        self._collection_cache.clear()
+        try:
+            self.client.close()
+        except AttributeError:  # chromadb < 1.1: stop the shared system instead
+            from chromadb.api.client import SharedSystemClient
+            self.client._system.stop()
+            SharedSystemClient.clear_system_cache()
+
+    def _checkpoint_sqlite(self):
+        """Flush the SQLite write-ahead log into the main database file.
+
+        Only safe once the ChromaDB client is released (see _tune_sqlite).
+
+        Raises:
+            RuntimeError: The checkpoint was blocked or left frames in the
+                WAL, so chroma.sqlite3 alone would miss committed writes
+        """
+        import sqlite3
+
+        db_path = self.persist_dir / "chroma.sqlite3"
+        if not db_path.exists():
+            return
+        con = sqlite3.connect(db_path)
+        try:
+            busy, log, checkpointed = con.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        finally:
+            con.close()
+        if busy or log != checkpointed:
+            raise RuntimeError(
+                f"Incomplete WAL checkpoint of {db_path} "
+                f"(busy={busy}, {checkpointed}/{log} frames); is another process using it?"
+            )
     
     @property
     def embedder(self):
         """Lazy load embedding model."""
         if self._embedder is None:
-            from sentence_transformers import SentenceTransformer
-            logger.info(f"Loading embedding model: {self.embedding_model_name}")
-            self._embedder = SentenceTransformer(self.embedding_model_name)
+            self.warm_up()
         return self._embedder
     
+    def warm_up(self):
+        """Load the embedding model now instead of on the first encode."""
+        if self._embedder is not None:
+            return
+        from sentence_transformers import SentenceTransformer
+        logger.info(f"Loading embedding model: {self.embedding_model_name} ({self.backend})")
+        if self.backend == "onnx":
+            try:
+                self._embedder = SentenceTransformer(
+                    self.embedding_model_name,
+                    backend="onnx",
+                    model_kwargs={"file_name": ONNX_QUANTIZED_FILE},
+                )
+            except Exception as e:
+                logger.warning(f"ONNX backend unavailable ({e}), falling back to torch")
+                self.backend = "torch"
+        if self._embedder is None:
+            self._embedder = SentenceTransformer(self.embedding_model_name)
+            if self.bf16:
+                self._autocast_bf16 = self._optimize_bf16(self._embedder)
+        # Warm up so session init isn't charged to the first real batch
+        self._encode(["warmup"], show_progress_bar=False)
+
+    @staticmethod
+    def _optimize_bf16(model) -> bool:
+        """Convert a torch SentenceTransformer's transformer to BF16 via IPEX.
+
+        Returns:
+            True if the model was converted (encode must then run under
+            BF16 autocast), False if IPEX is unavailable
+        """
+        try:
+            import intel_extension_for_pytorch as ipex
+            import torch
+        except ImportError:
+            logger.debug("intel_extension_for_pytorch not installed, using FP32")
+            return False
+
+        try:
+            model[0].auto_model = ipex.optimize(model[0].auto_model.eval(), dtype=torch.bfloat16)
+        except Exception as e:
+            logger.warning(f"BF16 optimization failed ({e}), using FP32")
+            return False
+        logger.info("Embedding model optimized for BF16")
+        return True
+
+    @property
+    def embedding_precision(self) -> str:
+        """Numeric precision documents are embedded at: 'int8', 'bf16' or 'fp32'."""
+        if self.backend == "onnx":
+            return "int8"
+        return "bf16" if self._autocast_bf16 else "fp32"
+
+    def _encode(self, texts: list[str], **kwargs):
+        """Encode texts, under BF16 autocast when the model was converted.
+
+        Calls from different threads are serialized on the shared model.
+        """
+        if self.hnsw_space == "ip":
+            # Unit-norm vectors make inner product equal cosine similarity
+            kwargs.setdefault("normalize_embeddings", True)
+        embedder = self.embedder
+        with self._encode_lock:
+            if not self._autocast_bf16:
+                return embedder.encode(texts, **kwargs)
+
+            import torch
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                return embedder.encode(texts, **kwargs)
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Embed one query as a read-only (1, dim) array, safe to cache."""
+        embedding = self._encode([query], convert_to_numpy=True)
+        embedding.setflags(write=False)
+        return embedding
+
     def create_collections(self, vehicle_type: str) -> dict[str, chromadb.Collection]:
         """Create collections for a vehicle type.
         
@@ -80,6 +320,10 @@ class KnowledgeBaseBuilder:
             
         Returns:
             Dict mapping category to collection
+
+        Raises:
+            ValueError: An existing collection uses a different distance
+                space and the builder was not created with rebuild=True
         """
         categories = [
             "engine", "drivetrain", "electrical", "chassis", "body",
@@ -90,66 +334,173 @@ class KnowledgeBaseBuilder:
         collections = {}
         for category in categories:
             name = f"{vehicle_type}_{category}"
+            if name in self._collection_cache:
+                collections[category] = self._collection_cache[name]
+                continue
             try:
                 collection = self.client.get_or_create_collection(
                     name=name,
-                    metadata={"hnsw:space": "cosine"}
+                    metadata={"hnsw:space": self.hnsw_space}
                 )
-                collections[category] = collection
-                logger.info(f"Created/loaded collection: {name}")
             except Exception as e:
                 logger.error(f"Failed to create collection {name}: {e}")
+                continue
+            existing_space = (collection.metadata or {}).get("hnsw:space", "l2")
+            if existing_space != self.hnsw_space:
+                if not self.rebuild:
+                    raise ValueError(
+                        f"Collection {name} uses hnsw:space {existing_space!r}, not "
+                        f"{self.hnsw_space!r}; pass rebuild=True (--rebuild) to drop "
+                        f"and recreate it"
+                    )
+                logger.warning(
+                    f"Rebuilding collection {name}: hnsw:space {existing_space} -> {self.hnsw_space}"
+                )
+                self.client.delete_collection(name)
+                collection = self.client.create_collection(
+                    name=name,
+                    metadata={"hnsw:space": self.hnsw_space}
+                )
+            collections[category] = self._collection_cache[name] = collection
+            logger.info(f"Created/loaded collection: {name}")
         
         return collections
     
+    def _col(self, name: str) -> chromadb.Collection:
+        """Get a collection by name, resolving it through ChromaDB only once."""
+        collection = self._collection_cache.get(name)
+        if collection is None:
+            collection = self.client.get_collection(name)
+            self._collection_cache[name] = collection
+        return collection
+
     def add_chunks(
         self,
         collection: chromadb.Collection,
         chunks: list[Chunk],
-        batch_size: int = 100
+        batch_size: int = 64
     ):
         """Add chunks to a collection.
         
+        Chunks are embedded shortest-first so each batch pads to a similar
+        sequence length instead of the longest text in an arbitrary window,
+        then written with as few collection.add() calls as ChromaDB allows.
+
         Args:
             collection: ChromaDB collection
             chunks: List of chunks to add
             batch_size: Batch size for embedding
         """
-        total = len(chunks)
+        chunks = sorted(_dedupe_ids(chunks), key=lambda c: len(c.text))
+        embeddings = self._encode_chunks(chunks, batch_size)
+        self._add_preembedded(collection, chunks, embeddings)
         
-        for i in range(0, total, batch_size):
-            batch = chunks[i:i + batch_size]
-            
-            # Generate embeddings
-            texts = [c.text for c in batch]
-            embeddings = self.embedder.encode(texts, show_progress_bar=False).tolist()
+        logger.info(f"Added {len(chunks)} chunks")
+
+    def _encode_chunks(self, chunks: list[Chunk], batch_size: int) -> np.ndarray:
+        """Embed chunk texts, running the model once per distinct text.
+
+        Boilerplate and overlapping chunks often repeat verbatim; duplicates
+        get a copy of the first occurrence's row. Input order (and so any
+        length sort) is preserved.
+
+        Returns:
+            Array with one embedding row per chunk
+        """
+        unique: dict[str, int] = {}
+        rows = [unique.setdefault(c.text, len(unique)) for c in chunks]
+        embeddings = self._encode(
+            list(unique), batch_size=batch_size,
+            show_progress_bar=False, convert_to_numpy=True,
+        )
+        if len(unique) == len(chunks):
+            return embeddings
+        logger.debug(f"Skipped embedding {len(chunks) - len(unique)} duplicate chunk texts")
+        return embeddings[rows]
+
+    def _add_preembedded(
+        self,
+        collection: chromadb.Collection,
+        chunks: list[Chunk],
+        embeddings: np.ndarray,
+        batch_size: Optional[int] = None
+    ):
+        """Write chunks whose embeddings are already computed.
+
+        *embeddings* is passed to ChromaDB as the float32 array returned by
+        encode() — no per-float Python list conversion. Writes are split
+        into *batch_size* rows per collection.add(), capped at (and by
+        default equal to) ChromaDB's maximum batch size.  Writes to one
+        collection are serialized across threads.
+        """
+        step = min(batch_size or self._max_add_batch, self._max_add_batch)
+        lock = self._write_locks.setdefault(collection.name, threading.Lock())
+        with lock:
+            for i in range(0, len(chunks), step):
+                batch = chunks[i:i + step]
+                collection.add(
+                    ids=[c.id for c in batch],
+                    documents=[c.text for c in batch],
+                    embeddings=embeddings[i:i + step],
+                    metadatas=[_safe_meta(c) for c in batch],
+                )
+
+    def _embed_and_store(
+        self,
+        collections: dict[str, chromadb.Collection],
+        chunks: list[Chunk],
+        batch_size: int = 128,
+        add_batch_size: Optional[int] = None
+    ) -> int:
+        """Embed chunks from many documents in one pass, then store by category.
+
+        Args:
+            collections: Dict mapping category to collection
+            chunks: Chunks whose category is present in *collections*
+            batch_size: Batch size for embedding
+            add_batch_size: Rows per collection.add() (default: ChromaDB max)
             
-            # Add to collection — filter metadata to ChromaDB-safe types
-            def _safe_meta(c):
-                raw = {"source": c.source, "source_id": c.source_id, "category": c.category, **c.metadata}
-                return {k: v for k, v in raw.items() if isinstance(v, (str, int, float, bool))}
-
-            collection.add(
-                ids=[c.id for c in batch],
-                documents=texts,
-                embeddings=embeddings,
-                metadatas=[_safe_meta(c) for c in batch],
+        Returns:
+            Number of chunks stored
+        """
+        chunks = sorted(_dedupe_ids(chunks), key=lambda c: len(c.text))
+        embeddings = self._encode_chunks(chunks, batch_size)
+
+        by_category: dict[str, tuple[list[Chunk], list[int]]] = {}
+        for i, chunk in enumerate(chunks):
+            cat_chunks, cat_rows = by_category.setdefault(chunk.category, ([], []))
+            cat_chunks.append(chunk)
+            cat_rows.append(i)
+
+        for category, (cat_chunks, cat_rows) in by_category.items():
+            self._add_preembedded(
+                collections[category], cat_chunks, embeddings[cat_rows], add_batch_size
             )
-            
-            logger.info(f"Added {min(i + batch_size, total)}/{total} chunks")
+
+        logger.info(f"Embedded and stored {len(chunks)} chunks")
+        return len(chunks)
     
     def add_documents_from_file(
         self,
         vehicle_type: str,
         jsonl_file: Path,
-        chunker=None
+        chunker=None,
+        flush_every: int = 5000,
+        batch_size: Optional[int] = None
     ) -> int:
         """Add documents from a JSONL file.
         
+        Chunks from all documents are pooled and embedded together rather
+        than one small encode() call per document; the pool is flushed every
+        *flush_every* chunks to bound memory.
+
         Args:
             vehicle_type: Vehicle type code
             jsonl_file: Path to JSONL file with documents
             chunker: Optional chunker instance
+            flush_every: Max chunks held before embedding and storing
+            batch_size: Rows per collection.add() call (default: the
+                largest batch ChromaDB accepts)
             
         Returns:
             Number of chunks added
@@ -161,30 +512,37 @@ class KnowledgeBaseBuilder:
             chunker = SmartChunker()
         
         total_chunks = 0
+        pending: list[Chunk] = []
+        loads = orjson.loads if orjson is not None else json.loads
         
-        with open(jsonl_file) as f:
+        # Binary mode: both parsers take bytes, skipping TextIOWrapper decoding
+        with open(jsonl_file, "rb") as f:
             for line in f:
-                doc = json.loads(line)
-                
-                # Chunk the document
-                chunks = chunker.chunk_document(doc)
-                
-                # Group by category
-                by_category = {}
-                for chunk in chunks:
-                    cat = chunk.category
-                    if cat not in by_category:
-                        by_category[cat] = []
-                    by_category[cat].append(chunk)
-                
-                # Add to appropriate collections
-                for category, cat_chunks in by_category.items():
-                    if category in collections:
-                        self.add_chunks(collections[category], cat_chunks)
-                        total_chunks += len(cat_chunks)
+                doc = loads(line)
+                pending.extend(
+                    c for c in chunker.chunk_document(doc) if c.category in collections
+                )
+                if len(pending) >= flush_every:
+                    total_chunks += self._embed_and_store(
+                        collections, pending, add_batch_size=batch_size
+                    )
+                    pending = []
+
+        if pending:
+            total_chunks += self._embed_and_store(collections, pending, add_batch_size=batch_size)
         
         return total_chunks
     
+    async def aadd_documents_from_file(self, *args, **kwargs) -> int:
+        """Async add_documents_from_file, run in a worker thread.
+
+        Lets several JSONL files load concurrently (e.g. via asyncio.gather)
+        while parsing and chunking overlap with embedding and ChromaDB writes;
+        the encode() calls themselves take turns on the shared model.
+        Takes the same arguments as add_documents_from_file().
+        """
+        return await asyncio.to_thread(self.add_documents_from_file, *args, **kwargs)
+
     def search(
         self,
         vehicle_type: str,
@@ -206,36 +564,69 @@ class KnowledgeBaseBuilder:
         if categories is None:
             categories = ["engine", "drivetrain", "chassis", "electrical", "general"]
         
-        # Generate query embedding
-        query_embedding = self.embedder.encode([query])[0].tolist()
+        # Generate query embedding once, then query collections concurrently
+        query_embedding = self._embed_query(query)
         
         results = []
-        
-        for category in categories:
-            collection_name = f"{vehicle_type}_{category}"
-            try:
-                collection = self.client.get_collection(collection_name)
-                result = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=n_results
+        if len(categories) <= 2:
+            # Not worth a thread hop
+            for category in categories:
+                results.extend(self._query_one(vehicle_type, category, query_embedding, n_results))
+        else:
+            if self._query_pool is None:
+                self._query_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kb-search")
+            futures = [
+                self._query_pool.submit(
+                    self._query_one, vehicle_type, category, query_embedding, n_results
                 )
-                
-                # Format results
-                for i, doc_id in enumerate(result["ids"][0]):
-                    results.append({
-                        "id": doc_id,
-                        "text": result["documents"][0][i],
-                        "category": category,
-                        "distance": result["distances"][0][i] if result["distances"] else None,
-                        "metadata": result["metadatas"][0][i] if result["metadatas"] else {}
-                    })
-            except Exception as e:
-                logger.debug(f"Collection {collection_name} not found: {e}")
-        
-        # Sort by distance (similarity)
-        results.sort(key=lambda x: x.get("distance", 1.0))
-        
-        return results[:n_results]
+                for category in categories
+            ]
+            for future in futures:
+                results.extend(future.result())
+
+        if not results:
+            return []
+
+        # Top-k by distance (similarity): O(N) partition, then sort only k
+        dists = np.fromiter(
+            (1.0 if r["distance"] is None else r["distance"] for r in results),
+            dtype=np.float32, count=len(results),
+        )
+        k = min(n_results, len(results))
+        idx = np.argpartition(dists, k - 1)[:k]
+        idx = idx[np.argsort(dists[idx], kind="stable")]
+        return [results[i] for i in idx]
+
+    def _query_one(
+        self,
+        vehicle_type: str,
+        category: str,
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> list[dict]:
+        """Query a single category collection; missing collections yield []."""
+        collection_name = f"{vehicle_type}_{category}"
+        try:
+            collection = self._col(collection_name)
+            result = collection.query(
+                query_embeddings=query_embedding,
+                n_results=n_results
+            )
+        except Exception as e:
+            logger.debug(f"Collection {collection_name} not found: {e}")
+            return []
+
+        # Format results
+        return [
+            {
+                "id": doc_id,
+                "text": result["documents"][0][i],
+                "category": category,
+                "distance": result["distances"][0][i] if result["distances"] else None,
+                "metadata": result["metadatas"][0][i] if result["metadatas"] else {}
+            }
+            for i, doc_id in enumerate(result["ids"][0])
+        ]
     
     def get_stats(self, vehicle_type: str) -> dict:
         """Get statistics for a vehicle's knowledge base.
@@ -257,78 +648,170 @@ class KnowledgeBaseBuilder:
         
         return stats
     
-    def export(self, vehicle_type: str, output_path: Path, version: str = "1.0.0"):
+    def export(self, vehicle_type: str, output_path: Path, version: str = "1.0.0") -> Path:
         """Export knowledge base as a distributable, signed archive.
         
-        Produces a .tar.gz containing:
+        Produces a .tar.gz (or .tar.zst) containing:
             manifest.json      — version, stats, embedding model, build date
             chromadb/           — full ChromaDB persistent data for this vehicle
         
+        A ``.zst`` output path is compressed with multi-threaded zstd; if the
+        ``zstandard`` package is missing it falls back to gzip and the
+        suffix is rewritten to ``.tar.gz``.
+
         Args:
             vehicle_type: Vehicle type code  (e.g. 'fzj80')
-            output_path:  Destination .tar.gz path
+            output_path:  Destination .tar.gz or .tar.zst path
             version:      Semantic version string
+
+        Returns:
+            Path of the archive actually written
         """
-        import datetime
-        import shutil
+        import io
         import tarfile
+        import time
+        from datetime import datetime, timezone
         
         stats = self.get_stats(vehicle_type)
         if stats["total_chunks"] == 0:
             logger.warning("No chunks found for %s — export will be empty!", vehicle_type)
-
-        export_dir = output_path.parent / f"{vehicle_type}_export"
-        if export_dir.exists():
-            shutil.rmtree(export_dir)
-        export_dir.mkdir(parents=True)
-        
-        # ── 1. Copy the ChromaDB persistent data ──────────────
-        # ChromaDB PersistentClient stores everything under self.persist_dir.
-        # We copy only the SQLite DB and the collection-level subdirectories
-        # that belong to this vehicle type.
-        chromadb_export = export_dir / "chromadb"
-        chromadb_export.mkdir()
-
-        # The PersistentClient stores a chroma.sqlite3 that contains ALL
-        # collections.  We copy the entire persist_dir and then remove
-        # collections that don't belong to this vehicle.
-        shutil.copytree(self.persist_dir, chromadb_export, dirs_exist_ok=True)
-
-        # Remove any __pycache__ or temp files
-        for junk in chromadb_export.rglob("__pycache__"):
-            shutil.rmtree(junk, ignore_errors=True)
         
-        # ── 2. Write manifest ─────────────────────────────────
+        # ── 1. Build manifest ─────────────────────────────────
+        now = time.time()
         manifest = {
             "vehicle_type": vehicle_type,
             "version": version,
-            "built_at": datetime.datetime.utcnow().isoformat() + "Z",
+            "built_at": datetime.fromtimestamp(now, tz=timezone.utc)
+                .isoformat(timespec="seconds").replace("+00:00", "Z"),
             "embedding_model": self.embedding_model_name,
+            "embedding_backend": self.backend,
+            "embedding_precision": self.embedding_precision,
             "collections": list(stats["collections"].keys()),
             "total_chunks": stats["total_chunks"],
             "stats": stats,
         }
+        manifest_bytes = json.dumps(manifest, indent=2).encode()
+
+        # ── 2. Stream ChromaDB data + manifest into the tarball ─
+        # No intermediate copy of persist_dir: the SQLite DB (which holds
+        # ALL collections) and only this vehicle's segment directories are
+        # added straight from disk.
+        collection_ids = [
+            str(c.id) for c in self.client.list_collections()
+            if c.name.startswith(f"{vehicle_type}_")
+        ]
         
-        manifest_path = export_dir / "manifest.json"
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2)
-        
-        # Also copy manifest to top level for easy access after extraction
-        # (check-update.sh expects data/manifest.json)
-        
-        # ── 3. Create tarball ─────────────────────────────────
         output_path = Path(output_path)
-        with tarfile.open(output_path, "w:gz") as tar:
-            tar.add(str(export_dir), arcname=vehicle_type)
+        cctx = None
+        if output_path.suffix == ".zst":
+            try:
+                import zstandard
+                cctx = zstandard.ZstdCompressor(level=10, threads=-1)
+            except ImportError:
+                output_path = output_path.with_name(
+                    output_path.name.removesuffix(".zst").removesuffix(".tar") + ".tar.gz"
+                )
+                logger.warning("zstandard not installed — writing gzip pack %s", output_path)
         
-        # Cleanup
-        shutil.rmtree(export_dir)
+        def _write(tar: tarfile.TarFile):
+            tar.add(
+                str(self.persist_dir / "chroma.sqlite3"),
+                arcname=f"{vehicle_type}/chromadb/chroma.sqlite3",
+            )
+            for segment_dir in self._segment_dirs(vehicle_type, collection_ids):
+                tar.add(
+                    str(segment_dir),
+                    arcname=f"{vehicle_type}/chromadb/{segment_dir.name}",
+                    filter=lambda ti: None if "__pycache__" in ti.name else ti,
+                )
+
+            info = tarfile.TarInfo(f"{vehicle_type}/manifest.json")
+            info.size = len(manifest_bytes)
+            info.mtime = int(now)
+            tar.addfile(info, io.BytesIO(manifest_bytes))
+
+        # ChromaDB must let go of chroma.sqlite3 before our own connections
+        # touch it (see _tune_sqlite); it is reopened once the pack is written
+        self._release_client()
+        try:
+            # Fold WAL frames back into chroma.sqlite3 so the archived file is complete
+            self._checkpoint_sqlite()
+            if cctx is not None:
+                # Plain streamed tar ("w|") through the zstd frame writer
+                with open(output_path, "wb") as raw, cctx.stream_writer(raw) as comp, \
+                        tarfile.open(fileobj=comp, mode="w|") as tar:
+                    _write(tar)
+            else:
+                with tarfile.open(output_path, "w:gz") as tar:
+                    _write(tar)
+        finally:
+            self.client = self._open_client()
         
         size_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(
             "Exported %s knowledge pack v%s → %s (%.1f MB, %d chunks)",
             vehicle_type, version, output_path, size_mb, stats["total_chunks"],
         )
+        return output_path
+
+    def _segment_dirs(self, vehicle_type: str, collection_ids: list[str]) -> list[Path]:
+        """On-disk segment directories belonging to a vehicle's collections.
+
+        ChromaDB names each HNSW index directory after its segment ID (not
+        the collection ID), so the mapping is read from the segments table.
+        Falls back to every subdirectory if the schema can't be read. Reads
+        chroma.sqlite3 directly, so the client must already be released.
+        """
+        import sqlite3
+
+        if not collection_ids:
+            return []
+        subdirs = [p for p in self.persist_dir.iterdir() if p.is_dir()]
+
+        db_uri = (self.persist_dir / "chroma.sqlite3").as_uri() + "?mode=ro"
+        placeholders = ",".join("?" * len(collection_ids))
+        try:
+            conn = sqlite3.connect(db_uri, uri=True)
+            try:
+                rows = conn.execute(
+                    f"SELECT id FROM segments WHERE collection IN ({placeholders})",
+                    collection_ids,
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Could not map segments for %s (%s), exporting all", vehicle_type, e)
+            return subdirs
+
+        segment_ids = {row[0] for row in rows}
+        return [p for p in subdirs if p.name in segment_ids]
+
+
+def export_quantized_onnx(
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+    output_dir: Optional[Path] = None,
+) -> Path:
+    """Export a dynamically INT8-quantized ONNX copy of an embedding model.
+
+    Only needed for models whose hub repo doesn't already ship
+    ``ONNX_QUANTIZED_FILE``.  Pass the returned directory as
+    ``embedding_model`` to use it.
+
+    Args:
+        embedding_model: Sentence transformer model name
+        output_dir: Where to save the exported model (default: HF cache name)
+
+    Returns:
+        Directory containing the quantized model
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    output_dir = Path(output_dir or Path("data/models") / embedding_model.split("/")[-1])
+    model = SentenceTransformer(embedding_model, backend="onnx")
+    model.save(str(output_dir))
+    export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(output_dir))
+    logger.info(f"Exported quantized ONNX model to {output_dir}")
+    return output_dir
 
 
 def main():
@@ -7,6 +7,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled once — these run for every document during ingestion
+_STEP_DETECT = re.compile(r"^\s*\d+[\.\)]\s", re.MULTILINE)
+_STEP_SPLIT = re.compile(r"(^\s*\d+[\.\)]\s.*?)(?=^\s*\d+[\.\)]\s|\Z)", re.MULTILINE | re.DOTALL)
+_QA_SPLIT = re.compile(r"\n(?=Response:|Answer:)")
+_SECTION_SPLIT = re.compile(r"\n(?=[A-Z][A-Z\s]+:|\#+ )")
+_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
 
 @dataclass
 class Chunk:
@@ -81,54 +88,55 @@ class SmartChunker:
         chunks = []
         
         # Check if content has numbered steps
-        has_steps = bool(re.search(r"^\s*\d+[\.\)]\s", content, re.MULTILINE))
+        has_steps = bool(_STEP_DETECT.search(content))
         
+        # Title context is prepended as each chunk is built
         if has_steps:
-            chunks = self._chunk_procedure(content, doc)
+            chunks = self._chunk_procedure(content, doc, prefix=title)
         else:
-            chunks = self._chunk_by_sections(content, doc)
-        
-        # Add title context to each chunk
-        for chunk in chunks:
-            if title and title not in chunk.text:
-                chunk.text = f"{title}\n\n{chunk.text}"
+            chunks = self._chunk_by_sections(content, doc, prefix=title)
         
         return chunks
     
-    def _chunk_procedure(self, content: str, doc: dict) -> list[Chunk]:
+    def _chunk_procedure(self, content: str, doc: dict, prefix: str = "") -> list[Chunk]:
         """Chunk procedural content, keeping step groups together."""
         chunks = []
         
         # Split into steps
-        step_pattern = r"(^\s*\d+[\.\)]\s.*?)(?=^\s*\d+[\.\)]\s|\Z)"
-        steps = re.findall(step_pattern, content, re.MULTILINE | re.DOTALL)
+        steps = _STEP_SPLIT.findall(content)
         
         if not steps:
-            return self._chunk_by_size(content, doc)
+            return self._chunk_by_size(content, doc, prefix=prefix)
         
-        current_chunk = ""
+        # Accumulate pieces + running length; join once per emitted chunk
+        parts: list[str] = []
+        length = 0
         step_start = 0
         
         for i, step in enumerate(steps):
             # Check if adding this step exceeds chunk size
-            if len(current_chunk) + len(step) > self.chunk_size and current_chunk:
+            if length + len(step) > self.chunk_size and length:
                 chunk = self._create_chunk(
-                    current_chunk,
+                    "".join(parts),
                     doc,
-                    suffix=f"_steps_{step_start}-{i}"
+                    suffix=f"_steps_{step_start}-{i}",
+                    prefix=prefix,
                 )
                 chunks.append(chunk)
-                current_chunk = step
+                parts = [step]
+                length = len(step)
                 step_start = i + 1
             else:
-                current_chunk += step
+                parts.append(step)
+                length += len(step)
         
         # Add final chunk
-        if current_chunk and len(current_chunk) >= self.min_chunk_size:
+        if length and length >= self.min_chunk_size:
             chunk = self._create_chunk(
-                current_chunk,
+                "".join(parts),
                 doc,
-                suffix=f"_steps_{step_start}-{len(steps)}"
+                suffix=f"_steps_{step_start}-{len(steps)}",
+                prefix=prefix,
             )
             chunks.append(chunk)
         
@@ -158,7 +166,7 @@ class SmartChunker:
         chunks = []
         
         # Extract question part
-        parts = re.split(r"\n(?=Response:|Answer:)", content)
+        parts = _QA_SPLIT.split(content)
         question = parts[0] if parts else ""
         responses = parts[1:] if len(parts) > 1 else []
         
@@ -192,49 +200,63 @@ class SmartChunker:
         content = doc.get("content", "")
         return self._chunk_by_size(content, doc)
     
-    def _chunk_by_sections(self, content: str, doc: dict) -> list[Chunk]:
+    def _chunk_by_sections(self, content: str, doc: dict, prefix: str = "") -> list[Chunk]:
         """Chunk by section headers."""
         chunks = []
         
         # Split by headers
-        sections = re.split(r"\n(?=[A-Z][A-Z\s]+:|\#+ )", content)
+        sections = _SECTION_SPLIT.split(content)
         
-        current_chunk = ""
+        parts: list[str] = []
+        length = 0
         
         for section in sections:
-            if len(current_chunk) + len(section) > self.chunk_size and current_chunk:
-                chunk = self._create_chunk(current_chunk, doc)
-                chunks.append(chunk)
-                current_chunk = section
+            if length + len(section) > self.chunk_size and length:
+                chunks.append(self._create_chunk("\n".join(parts), doc, prefix=prefix))
+                parts = [section]
+                length = len(section)
+            elif length:
+                parts.append(section)
+                length += 1 + len(section)
             else:
-                current_chunk += "\n" + section if current_chunk else section
+                parts = [section]
+                length = len(section)
         
-        if current_chunk and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(self._create_chunk(current_chunk, doc))
+        if length and length >= self.min_chunk_size:
+            chunks.append(self._create_chunk("\n".join(parts), doc, prefix=prefix))
         
-        return chunks if chunks else self._chunk_by_size(content, doc)
+        return chunks if chunks else self._chunk_by_size(content, doc, prefix=prefix)
     
-    def _chunk_by_size(self, content: str, doc: dict) -> list[Chunk]:
+    def _chunk_by_size(self, content: str, doc: dict, prefix: str = "") -> list[Chunk]:
         """Simple size-based chunking with overlap."""
         chunks = []
         
         # Split into sentences
-        sentences = re.split(r"(?<=[.!?])\s+", content)
+        sentences = _SENT_SPLIT.split(content)
         
-        current_chunk = ""
+        # Accumulate sentences + running length instead of growing a string
+        # with += (quadratic); the chunk text is joined once when emitted.
+        parts: list[str] = []
+        length = 0
         
         for sentence in sentences:
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
-                chunks.append(self._create_chunk(current_chunk, doc))
+            if length + len(sentence) > self.chunk_size and length:
+                current_chunk = " ".join(parts)
+                chunks.append(self._create_chunk(current_chunk, doc, prefix=prefix))
                 
                 # Start new chunk with overlap
-                overlap_text = current_chunk[-self.chunk_overlap:] if len(current_chunk) > self.chunk_overlap else ""
-                current_chunk = overlap_text + sentence
+                overlap_text = current_chunk[-self.chunk_overlap:] if length > self.chunk_overlap else ""
+                parts = [overlap_text + sentence]
+                length = len(parts[0])
+            elif length:
+                parts.append(sentence)
+                length += 1 + len(sentence)
             else:
-                current_chunk += " " + sentence if current_chunk else sentence
+                parts = [sentence]
+                length = len(sentence)
         
-        if current_chunk and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(self._create_chunk(current_chunk, doc))
+        if length and length >= self.min_chunk_size:
+            chunks.append(self._create_chunk(" ".join(parts), doc, prefix=prefix))
         
         return chunks
     
@@ -242,14 +264,23 @@ class SmartChunker:
         self,
         text: str,
         doc: dict,
-        suffix: str = ""
+        suffix: str = "",
+        prefix: str = ""
     ) -> Chunk:
-        """Create a Chunk object from text and document metadata."""
+        """Create a Chunk object from text and document metadata.
+
+        *prefix* (e.g. the FSM section title) is prepended as context unless
+        the text already contains it; the ID is hashed from the final text.
+        """
         source = doc.get("source", "unknown")
         source_id = doc.get("source_id", "")
         
+        text = text.strip()
+        if prefix and prefix not in text:
+            text = f"{prefix}\n\n{text}"
+
         # Generate unique ID
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:8]
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
         chunk_id = f"{source}_{source_id}{suffix}_{text_hash}"
         
         # Build metadata, filtering out None values (ChromaDB rejects them)
@@ -267,7 +298,7 @@ class SmartChunker:
 
         return Chunk(
             id=chunk_id,
-            text=text.strip(),
+            text=text,
             source=source,
             source_id=source_id,
             category=doc.get("category", "general"),
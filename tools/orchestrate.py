@@ -9,6 +9,10 @@ Usage:
     python -m tools.orchestrate build                           # ChromaDB loading only
     python -m tools.orchestrate status                          # progress + collection counts
     python -m tools.orchestrate scrape --source ih8mud --max-threads 500
+    python -m tools.orchestrate scrape --scrape-concurrency 8
+    python -m tools.orchestrate build --hnsw-space ip --rebuild
+
+Exits with status 1 if any scraper failed.
 """
 
 from __future__ import annotations
@@ -17,7 +21,10 @@ import argparse
 import asyncio
 import json
 import logging
+import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -49,71 +56,90 @@ async def _scrape_yaml() -> None:
     logger.info("  YAML seed: %d documents -> %s", len(docs), output)
 
 
-async def _scrape_nhtsa() -> None:
+async def _scrape_nhtsa(request_slot: asyncio.Semaphore | None = None) -> None:
     logger.info("[scrape] NHTSA API ...")
     from tools.scrapers.nhtsa import run_scraper
-    await run_scraper()
+    await run_scraper(request_slot=request_slot)
 
 
-async def _scrape_web() -> None:
+async def _scrape_web(request_slot: asyncio.Semaphore | None = None) -> None:
     logger.info("[scrape] Web articles ...")
     from tools.scrapers.web_articles import run_scraper
-    await run_scraper()
+    await run_scraper(request_slot=request_slot)
 
 
 async def _scrape_fsm() -> None:
     logger.info("[scrape] FSM PDF download ...")
     from tools.scrapers.fsm_downloader import download_fsm
-    download_fsm()
+    # Blocking download — keep it off the event loop so other sources proceed
+    await asyncio.to_thread(download_fsm)
 
 
-async def _scrape_sor(max_pages: int = 50) -> None:
+async def _scrape_sor(max_pages: int = 50, request_slot: asyncio.Semaphore | None = None) -> None:
     logger.info("[scrape] SOR parts catalog ...")
     from tools.scrapers.sor import run_scraper
-    await run_scraper(max_pages=max_pages)
+    await run_scraper(max_pages=max_pages, request_slot=request_slot)
 
 
-async def _scrape_ih8mud(max_threads: int | None = None, index_only: bool = False) -> None:
+async def _scrape_ih8mud(
+    max_threads: int | None = None,
+    index_only: bool = False,
+    request_slot: asyncio.Semaphore | None = None,
+) -> None:
     logger.info("[scrape] IH8MUD forums ...")
     from tools.scrapers.ih8mud import run_scraper
-    await run_scraper(max_threads=max_threads, index_only=index_only)
+    await run_scraper(max_threads=max_threads, index_only=index_only, request_slot=request_slot)
 
 
 async def scrape_all(
     source: str | None = None,
     max_threads: int | None = None,
     index_only: bool = False,
-) -> None:
-    """Run all scrapers (or a single one if --source is given)."""
+    concurrency: int | None = None,
+) -> list[str]:
+    """Run all scrapers (or a single one if --source is given).
+
+    Each HTTP scraper gets its own semaphore capping its in-flight requests
+    at *concurrency* (default ``DEFAULT_REQUEST_CONCURRENCY``).
+
+    Returns:
+        Names of the sources that failed (empty if all succeeded)
+    """
+    from tools.scrapers.base import DEFAULT_REQUEST_CONCURRENCY
+
+    limit = max(1, concurrency or DEFAULT_REQUEST_CONCURRENCY)
+    # Created here, on the running loop, one per source: scrapers don't
+    # throttle each other and nothing outlives this event loop
+    scrapers = {
+        "yaml": _scrape_yaml,
+        "nhtsa": lambda: _scrape_nhtsa(request_slot=asyncio.Semaphore(limit)),
+        "web": lambda: _scrape_web(request_slot=asyncio.Semaphore(limit)),
+        "fsm": _scrape_fsm,
+        "sor": lambda: _scrape_sor(request_slot=asyncio.Semaphore(limit)),
+        "ih8mud": lambda: _scrape_ih8mud(
+            max_threads=max_threads, index_only=index_only,
+            request_slot=asyncio.Semaphore(limit),
+        ),
+    }
+
     if source:
-        dispatch = {
-            "yaml": _scrape_yaml,
-            "nhtsa": lambda: _scrape_nhtsa(),
-            "web": lambda: _scrape_web(),
-            "fsm": lambda: _scrape_fsm(),
-            "sor": lambda: _scrape_sor(),
-            "ih8mud": lambda: _scrape_ih8mud(max_threads=max_threads, index_only=index_only),
-        }
-        fn = dispatch.get(source)
+        fn = scrapers.get(source)
         if fn is None:
-            logger.error("Unknown source: %s  (choices: %s)", source, ", ".join(dispatch))
-            return
+            logger.error("Unknown source: %s  (choices: %s)", source, ", ".join(scrapers))
+            return [source]
         await fn()
-        return
-
-    # Run in priority order: fast sources first, slow last
-    await _scrape_yaml()
-
-    # These can run concurrently (different network targets)
-    await asyncio.gather(
-        _scrape_nhtsa(),
-        _scrape_web(),
-        _scrape_fsm(),
-        _scrape_sor(),
-    )
+        return []
 
-    # IH8MUD is slowest — run last, resumable
-    await _scrape_ih8mud(max_threads=max_threads, index_only=index_only)
+    # No ordering dependencies between sources — fan out all of them.
+    # IH8MUD is slowest but resumable; a failure in one source doesn't
+    # cancel the others.
+    results = await asyncio.gather(*(fn() for fn in scrapers.values()), return_exceptions=True)
+    failed = []
+    for name, result in zip(scrapers, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error("[scrape] %s failed: %s", name, result)
+            failed.append(name)
+    return failed
 
 
 # ---------------------------------------------------------------------------
@@ -169,15 +195,16 @@ def _process_parts() -> int:
 
 
 def _process_forum() -> int:
-    from tools.processors.forum import process_forum_directory
+    from tools.processors.forum import stream_forum_directory
 
     raw = RAW_DIR / "forum" / "threads"
     output = DATA_DIR / f"{VEHICLE}_forum.jsonl"
     if not raw.exists():
         logger.warning("No forum raw data at %s — skipping", raw)
         return 0
-    docs = process_forum_directory(raw, output)
-    return len(docs)
+    return stream_forum_directory(
+        raw, output, cache_path=RAW_DIR / "forum" / ".process_cache.sqlite"
+    )
 
 
 def process_all() -> dict[str, int]:
@@ -187,20 +214,40 @@ def process_all() -> dict[str, int]:
     # YAML seed is already JSONL from the scrape stage
     yaml_jsonl = DATA_DIR / f"{VEHICLE}_yaml.jsonl"
     if yaml_jsonl.exists():
-        with open(yaml_jsonl) as f:
-            results["yaml"] = sum(1 for _ in f)
+        results["yaml"] = _count_lines(yaml_jsonl)
     else:
         results["yaml"] = 0
 
-    processors = [
+    # Light processors read disjoint raw dirs and write disjoint JSONL
+    # files, so they run side by side in threads.
+    threaded = [
         ("nhtsa", _process_nhtsa),
         ("web", _process_web),
-        ("fsm", _process_fsm),
         ("parts", _process_parts),
+    ]
+    # FSM OCR and forum parsing each start a fork-based process pool sized
+    # to the CPU count.  They run one after another on this thread, once the
+    # threads above have exited: forking while other threads run can
+    # deadlock the children, and two CPU-sized pools oversubscribe the cores.
+    pooled = [
+        ("fsm", _process_fsm),
         ("forum", _process_forum),
     ]
 
-    for name, fn in processors:
+    with ThreadPoolExecutor(max_workers=len(threaded)) as ex:
+        futures = {}
+        for name, fn in threaded:
+            logger.info("[process] %s ...", name)
+            futures[ex.submit(fn)] = name
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error("  %s failed: %s", name, e)
+                results[name] = 0
+
+    for name, fn in pooled:
         logger.info("[process] %s ...", name)
         try:
             results[name] = fn()
@@ -208,18 +255,30 @@ def process_all() -> dict[str, int]:
             logger.error("  %s failed: %s", name, e)
             results[name] = 0
 
-    return results
+    # Report in the fixed processor order, not completion order
+    order = ("nhtsa", "web", "fsm", "parts", "forum")
+    return {"yaml": results["yaml"], **{name: results[name] for name in order}}
 
 
 # ---------------------------------------------------------------------------
 # Build stage
 # ---------------------------------------------------------------------------
 
-def build_all() -> dict[str, int]:
-    """Load all JSONL files into ChromaDB."""
+async def abuild_all(
+    batch_size: int | None = None,
+    rebuild: bool = False,
+    hnsw_space: str = "cosine",
+) -> dict[str, int]:
+    """Load all JSONL files into ChromaDB, one concurrent task per file.
+
+    *batch_size* is the number of rows per ``collection.add`` call; by
+    default the builder uses the largest batch ChromaDB accepts.
+    *hnsw_space* is the collection distance ('cosine' or 'ip'); *rebuild*
+    drops and recreates collections built with a different distance space
+    instead of failing.
+    """
     from tools.kb_builder.builder import KnowledgeBaseBuilder
 
-    builder = KnowledgeBaseBuilder(CHROMADB_DIR)
     results: dict[str, int] = {}
 
     jsonl_files = sorted(DATA_DIR.glob(f"{VEHICLE}_*.jsonl"))
@@ -227,35 +286,53 @@ def build_all() -> dict[str, int]:
         logger.warning("No JSONL files found in %s", DATA_DIR)
         return results
 
-    for jsonl_path in jsonl_files:
-        name = jsonl_path.stem.replace(f"{VEHICLE}_", "")
-        logger.info("[build] Loading %s ...", jsonl_path.name)
-        try:
-            count = builder.add_documents_from_file(VEHICLE, jsonl_path)
+    with KnowledgeBaseBuilder(CHROMADB_DIR, hnsw_space=hnsw_space, rebuild=rebuild) as builder:
+        # Resolve collections and load the model once, before tasks race for them
+        builder.create_collections(VEHICLE)
+        builder.warm_up()
+
+        names = [p.stem.replace(f"{VEHICLE}_", "") for p in jsonl_files]
+        logger.info("[build] Loading %s ...", ", ".join(p.name for p in jsonl_files))
+        counts = await asyncio.gather(
+            *(builder.aadd_documents_from_file(VEHICLE, p, batch_size=batch_size) for p in jsonl_files),
+            return_exceptions=True,
+        )
+
+    for name, count in zip(names, counts, strict=True):
+        if isinstance(count, Exception):
+            logger.error("  %s failed: %s", name, count)
+            results[name] = 0
+        else:
             results[name] = count
             logger.info("  %s: %d chunks", name, count)
-        except Exception as e:
-            logger.error("  %s failed: %s", name, e)
-            results[name] = 0
 
     return results
 
 
-def export_pack() -> Path | None:
-    """Export the knowledge pack."""
+def build_all(
+    batch_size: int | None = None,
+    rebuild: bool = False,
+    hnsw_space: str = "cosine",
+) -> dict[str, int]:
+    """Synchronous wrapper around :func:`abuild_all`."""
+    return asyncio.run(abuild_all(batch_size=batch_size, rebuild=rebuild, hnsw_space=hnsw_space))
+
+
+def export_pack(hnsw_space: str = "cosine") -> Path | None:
+    """Export the knowledge pack built with distance *hnsw_space*."""
     from tools.kb_builder.builder import KnowledgeBaseBuilder
 
-    builder = KnowledgeBaseBuilder(CHROMADB_DIR)
     pack_dir = DATA_DIR / "knowledge_packs"
     pack_dir.mkdir(parents=True, exist_ok=True)
     output = pack_dir / f"{VEHICLE}_knowledge_pack.tar.gz"
 
-    stats = builder.get_stats(VEHICLE)
-    if stats["total_chunks"] == 0:
-        logger.warning("ChromaDB is empty — nothing to export")
-        return None
+    with KnowledgeBaseBuilder(CHROMADB_DIR, hnsw_space=hnsw_space) as builder:
+        stats = builder.get_stats(VEHICLE)
+        if stats["total_chunks"] == 0:
+            logger.warning("ChromaDB is empty — nothing to export")
+            return None
 
-    builder.export(VEHICLE, output)
+        builder.export(VEHICLE, output)
     return output
 
 
@@ -263,12 +340,27 @@ def export_pack() -> Path | None:
 # Status
 # ---------------------------------------------------------------------------
 
-def show_status() -> None:
+def _count_files(path: Path) -> int:
+    """Count regular files under *path* (os.walk reuses dirent types, no per-file stat)."""
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def _count_lines(path: Path) -> int:
+    """Count lines in *path* by scanning 1 MiB binary blocks for newlines."""
+    count = 0
+    last = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+            last = block
+    # An unterminated final line still counts, as with line iteration
+    return count + (1 if last and not last.endswith(b"\n") else 0)
+
+
+async def _show_status_async() -> None:
     """Print pipeline status: raw data, JSONL counts, ChromaDB collections."""
     print(f"=== RigSherpa KB Pipeline Status ({VEHICLE}) ===\n")
 
-    # Raw data
-    print("Raw data (data/raw/):")
     raw_sources = {
         "nhtsa": RAW_DIR / "nhtsa",
         "web": RAW_DIR / "web",
@@ -276,11 +368,22 @@ def show_status() -> None:
         "fsm": RAW_DIR / "fsm",
         "forum": RAW_DIR / "forum",
     }
-    for name, path in raw_sources.items():
-        if path.exists():
-            files = list(path.glob("**/*"))
-            file_count = sum(1 for f in files if f.is_file())
-            print(f"  {name:20s}  {file_count} files")
+    present = {name: path for name, path in raw_sources.items() if path.exists()}
+    jsonl_files = sorted(DATA_DIR.glob(f"{VEHICLE}_*.jsonl"))
+
+    # Walk every source dir and JSONL concurrently — slow mounts overlap
+    counts = await asyncio.gather(
+        *(asyncio.to_thread(_count_files, path) for path in present.values()),
+        *(asyncio.to_thread(_count_lines, jsonl) for jsonl in jsonl_files),
+    )
+    file_counts = dict(zip(present, counts[:len(present)], strict=True))
+    line_counts = counts[len(present):]
+
+    # Raw data
+    print("Raw data (data/raw/):")
+    for name in raw_sources:
+        if name in file_counts:
+            print(f"  {name:20s}  {file_counts[name]} files")
         else:
             print(f"  {name:20s}  (not scraped)")
 
@@ -297,9 +400,7 @@ def show_status() -> None:
 
     # JSONL files
     print("\nProcessed JSONL (data/):")
-    for jsonl in sorted(DATA_DIR.glob(f"{VEHICLE}_*.jsonl")):
-        with open(jsonl) as f:
-            count = sum(1 for _ in f)
+    for jsonl, count in zip(jsonl_files, line_counts, strict=True):
         size_kb = jsonl.stat().st_size / 1024
         print(f"  {jsonl.name:30s}  {count:>6} docs  ({size_kb:.1f} KB)")
 
@@ -308,8 +409,8 @@ def show_status() -> None:
     if CHROMADB_DIR.exists():
         try:
             from tools.kb_builder.builder import KnowledgeBaseBuilder
-            builder = KnowledgeBaseBuilder(CHROMADB_DIR)
-            stats = builder.get_stats(VEHICLE)
+            with KnowledgeBaseBuilder(CHROMADB_DIR) as builder:
+                stats = builder.get_stats(VEHICLE)
             for cat, count in sorted(stats["collections"].items()):
                 marker = "  " if count > 0 else "!!"
                 print(f"  {marker} {cat:25s}  {count:>6} chunks")
@@ -328,11 +429,16 @@ def show_status() -> None:
         print("\nKnowledge pack: (not exported yet)")
 
 
+def show_status() -> None:
+    """Sync wrapper around :func:`_show_status_async`."""
+    asyncio.run(_show_status_async())
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
-async def _main():
+async def _main() -> int:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     parser = argparse.ArgumentParser(
@@ -346,6 +452,10 @@ Commands:
   build     Load JSONL into ChromaDB
   export    Export knowledge pack
   status    Show pipeline progress
+
+If uvloop is installed (pip install -e ".[build]" on Linux/macOS), it
+replaces the default asyncio event loop, typically cutting scrape wall
+time on many-connection runs.
         """,
     )
     parser.add_argument("command", choices=["all", "scrape", "process", "build", "export", "status"])
@@ -355,19 +465,30 @@ Commands:
                         help="Max IH8MUD threads to scrape")
     parser.add_argument("--index-only", action="store_true",
                         help="IH8MUD index pass only")
+    parser.add_argument("--scrape-concurrency", type=int, default=None,
+                        help="Max in-flight HTTP requests per scraper (default 4)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Rows per ChromaDB add call when building (default: ChromaDB max)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Drop and recreate collections built with a different distance space")
+    parser.add_argument("--hnsw-space", choices=["cosine", "ip"], default="cosine",
+                        help="Collection distance: cosine, or ip on L2-normalized embeddings "
+                             "(switching an existing build needs --rebuild)")
     args = parser.parse_args()
 
     t0 = time.time()
 
     if args.command == "status":
-        show_status()
-        return
+        await _show_status_async()
+        return 0
 
+    failed: list[str] = []
     if args.command in ("all", "scrape"):
-        await scrape_all(
+        failed = await scrape_all(
             source=args.source,
             max_threads=args.max_threads,
             index_only=args.index_only,
+            concurrency=args.scrape_concurrency,
         )
 
     if args.command in ("all", "process"):
@@ -377,22 +498,33 @@ Commands:
             print(f"  {name}: {count} documents")
 
     if args.command in ("all", "build"):
-        results = build_all()
+        results = await abuild_all(
+            batch_size=args.batch_size, rebuild=args.rebuild, hnsw_space=args.hnsw_space,
+        )
         print("\nBuild results:")
         for name, count in results.items():
             print(f"  {name}: {count} chunks")
 
     if args.command in ("all", "export"):
-        pack = export_pack()
+        pack = export_pack(hnsw_space=args.hnsw_space)
         if pack:
             print(f"\nExported: {pack}")
 
     elapsed = time.time() - t0
     print(f"\nCompleted in {elapsed:.1f}s")
+    if failed:
+        print(f"Failed scrapers: {', '.join(failed)}")
+        return 1
+    return 0
 
 
 def main():
-    asyncio.run(_main())
+    try:
+        import uvloop
+    except ImportError:  # optional faster event loop
+        sys.exit(asyncio.run(_main()))
+    else:
+        sys.exit(uvloop.run(_main()))
 
 
 if __name__ == "__main__":
@@ -38,10 +38,33 @@ import argparse
 import hashlib
 import json
 import logging
+import mmap
+import os
 import re
+import sqlite3
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
 from typing import Iterator
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON parsing/writing
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # optional speedup for dedup fingerprints
+    xxhash = None
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:  # optional near-duplicate detection
+    MinHash = MinHashLSH = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,6 +99,15 @@ _KEYWORD_CATEGORIES: list[tuple[re.Pattern, str]] = [
     (re.compile(r"wiring|fuse|relay|ecu|sensor|electrical", re.I), "forum_troubleshoot"),
 ]
 
+# All keyword patterns fused into one scan.  Each alternative is a named
+# group inside a zero-width lookahead, so every start position is tested
+# without consuming text; the lowest group index seen wins, preserving the
+# list's priority order.
+_KEYWORD_FUSED = re.compile(
+    "(?=" + "|".join(f"(?P<k{i}>{pattern.pattern})" for i, (pattern, _) in enumerate(_KEYWORD_CATEGORIES)) + ")",
+    re.I,
+)
+
 
 def map_category(forum_section: str, title: str = "") -> str:
     """Map a forum section name to a ChromaDB collection category."""
@@ -84,9 +116,13 @@ def map_category(forum_section: str, title: str = "") -> str:
         return _FORUM_SECTION_MAP[key]
 
     # Try keyword detection from title
-    for pattern, cat in _KEYWORD_CATEGORIES:
-        if pattern.search(title):
-            return cat
+    best = len(_KEYWORD_CATEGORIES)
+    for m in _KEYWORD_FUSED.finditer(title):
+        best = min(best, int(m.lastgroup[1:]))
+        if best == 0:
+            break
+    if best < len(_KEYWORD_CATEGORIES):
+        return _KEYWORD_CATEGORIES[best][1]
 
     return "forum_troubleshoot"  # default
 
@@ -109,9 +145,18 @@ def compute_quality_score(thread: dict) -> float:
     views = thread.get("views", 0)
     posts = thread.get("posts", [])
 
-    total_votes = sum(p.get("votes", 0) for p in posts)
-    max_votes = max((p.get("votes", 0) for p in posts), default=0)
-    total_content = sum(len(p.get("content", "")) for p in posts)
+    # Single pass over posts for all three aggregates
+    total_votes = 0
+    max_votes = None
+    total_content = 0
+    for p in posts:
+        v = p.get("votes") or 0
+        total_votes += v
+        if max_votes is None or v > max_votes:
+            max_votes = v
+        total_content += len(p.get("content", ""))
+    if max_votes is None:
+        max_votes = 0
 
     # Normalize each factor to 0–1
     reply_score = min(replies / 20.0, 1.0) if replies else 0
@@ -135,22 +180,35 @@ def compute_quality_score(thread: dict) -> float:
 # Normalization
 # ---------------------------------------------------------------------------
 
+# Quoted-reply blocks and common BBCode tags, stripped in one pass
+_BBCODE_RE = re.compile(
+    r"(?:^>.*\n?)+|\[/?(?:quote|img|url|b|i|u|code|size|color|font)[^\]]*\]",
+    re.I | re.MULTILINE,
+)
+_WS_NL_RE = re.compile(r"\n{3,}")
+_WS_SP_RE = re.compile(r" {2,}")
+
+
 def _clean_post_content(content: str) -> str:
     """Clean up raw forum post content."""
-    # Remove excessive quoting
-    content = re.sub(r"(?:^>.*\n?)+", "", content, flags=re.MULTILINE)
-    # Remove common forum artifacts
-    content = re.sub(r"\[/?(?:quote|img|url|b|i|u|code|size|color|font)[^\]]*\]", "", content, flags=re.I)
+    # Remove excessive quoting and common forum artifacts
+    content = _BBCODE_RE.sub("", content)
     # Collapse whitespace
-    content = re.sub(r"\n{3,}", "\n\n", content)
-    content = re.sub(r" {2,}", " ", content)
+    content = _WS_NL_RE.sub("\n\n", content)
+    content = _WS_SP_RE.sub(" ", content)
     return content.strip()
 
 
-def normalize_thread(thread: dict, min_post_length: int = 50) -> dict | None:
+def normalize_thread(
+    thread: dict,
+    min_post_length: int = 50,
+    min_quality: float = 0.0,
+) -> dict | None:
     """Normalize a single forum thread into a builder-compatible document.
 
-    Returns None if the thread doesn't meet quality thresholds.
+    Returns None if the thread doesn't meet quality thresholds.  The
+    quality score only reads raw post fields, so threads scoring below
+    *min_quality* are rejected before any post content is cleaned.
     """
     title = thread.get("title", "").strip()
     posts = thread.get("posts", [])
@@ -158,34 +216,44 @@ def normalize_thread(thread: dict, min_post_length: int = 50) -> dict | None:
     if not title or not posts:
         return None
 
-    # Extract OP (original post)
-    op_posts = [p for p in posts if p.get("is_op", False)]
-    op = op_posts[0] if op_posts else posts[0]
+    quality = compute_quality_score(thread)
+    if quality < min_quality:
+        logger.debug("Skipping low-quality thread: %s (%.2f)", title[:50], quality)
+        return None
+
+    # Extract OP (original post); tracked by index so responses skip it
+    # without comparing whole post dicts
+    op_idx = next((i for i, p in enumerate(posts) if p.get("is_op", False)), 0)
+    op = posts[op_idx]
     op_content = _clean_post_content(op.get("content", ""))
 
     if len(op_content) < min_post_length:
         return None
 
     # Build the combined content: question + best responses
-    response_posts = [p for p in posts if p != op and len(_clean_post_content(p.get("content", ""))) >= min_post_length]
+    # (each response is cleaned once; the cleaned text is reused below)
+    response_posts = []
+    for i, p in enumerate(posts):
+        if i == op_idx:
+            continue
+        cleaned = _clean_post_content(p.get("content", ""))
+        if len(cleaned) >= min_post_length:
+            response_posts.append((p, cleaned))
 
     # Sort by votes (best answers first)
-    response_posts.sort(key=lambda p: p.get("votes", 0), reverse=True)
+    response_posts.sort(key=lambda pc: pc[0].get("votes", 0), reverse=True)
 
     # Take top responses (limit to keep chunk size reasonable)
     top_responses = response_posts[:5]
 
     content_parts = [f"Question: {title}\n\n{op_content}"]
-    for resp in top_responses:
-        cleaned = _clean_post_content(resp.get("content", ""))
+    for resp, cleaned in top_responses:
         votes = resp.get("votes", 0)
         author = resp.get("author", "anonymous")
         content_parts.append(f"Response (by {author}, {votes} votes):\n{cleaned}")
 
     content = "\n\n".join(content_parts)
     category = map_category(thread.get("category", ""), title)
-    quality = compute_quality_score(thread)
-
     return {
         "source": "ih8mud",
         "source_id": str(thread.get("thread_id", "")),
@@ -209,20 +277,81 @@ def normalize_thread(thread: dict, min_post_length: int = 50) -> dict | None:
 # Deduplication
 # ---------------------------------------------------------------------------
 
-def deduplicate(documents: list[dict]) -> list[dict]:
-    """Remove near-duplicate documents based on content similarity."""
-    seen: set[str] = set()
-    unique: list[dict] = []
+def _fingerprint(data: bytes) -> int:
+    """64-bit non-cryptographic fingerprint (xxh3 if available, else BLAKE2b)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _intern_doc(doc: dict) -> dict:
+    """Share the few distinct source/category/vehicle strings across docs.
+
+    Applied as docs are parsed back from the output JSONL, the only docs
+    held in memory all at once; each parsed doc would otherwise carry its
+    own copy of these strings.
+    """
+    doc["source"] = sys.intern(doc["source"])
+    doc["category"] = sys.intern(doc["category"])
+    meta = doc.get("metadata")
+    if meta and "vehicle_type" in meta:
+        meta["vehicle_type"] = sys.intern(meta["vehicle_type"])
+    return doc
+
+
+def _doc_fingerprint(doc: dict) -> int:
+    """Fingerprint a document by its title + first 200 chars of content."""
+    return _fingerprint((doc.get("title", "") + doc.get("content", "")[:200]).encode())
 
-    for doc in documents:
-        # Use first 200 chars + title as fingerprint
-        fingerprint = hashlib.md5(
-            (doc.get("title", "") + doc.get("content", "")[:200]).encode()
-        ).hexdigest()
 
-        if fingerprint not in seen:
-            seen.add(fingerprint)
-            unique.append(doc)
+# MinHash near-duplicate parameters (used only when datasketch is installed)
+_SHINGLE_SIZE = 5
+_MINHASH_PERM = 64
+_NEAR_DUP_THRESHOLD = 0.85
+
+
+class _Deduplicator:
+    """Incremental duplicate detector for normalized forum docs.
+
+    Exact repeats of title + leading content are caught by a set of 64-bit
+    fingerprints.  When datasketch is installed, docs are also checked
+    against a MinHash LSH index over character 5-gram shingles of their
+    content, which catches cross-posted threads with small edits.
+    """
+
+    def __init__(self):
+        self._seen: set[int] = set()
+        self._lsh = None
+        if MinHashLSH is not None:
+            self._lsh = MinHashLSH(threshold=_NEAR_DUP_THRESHOLD, num_perm=_MINHASH_PERM)
+            # Generating permutations is the costly part of MinHash(); copies share them
+            self._empty = MinHash(num_perm=_MINHASH_PERM)
+            self._keys = 0
+
+    def is_duplicate(self, doc: dict) -> bool:
+        """Return True if *doc* duplicates one already seen; otherwise record it."""
+        fingerprint = _doc_fingerprint(doc)
+        if fingerprint in self._seen:
+            return True
+
+        content = doc.get("content", "")
+        if self._lsh is not None and len(content) >= _SHINGLE_SIZE:
+            shingles = {content[i:i + _SHINGLE_SIZE] for i in range(len(content) - _SHINGLE_SIZE + 1)}
+            m = self._empty.copy()
+            m.update_batch([s.encode() for s in shingles])
+            if self._lsh.query(m):
+                return True
+            self._lsh.insert(self._keys, m)
+            self._keys += 1
+
+        self._seen.add(fingerprint)
+        return False
+
+
+def deduplicate(documents: list[dict]) -> list[dict]:
+    """Remove exact and (with datasketch) near-duplicate documents."""
+    dedup = _Deduplicator()
+    unique = [doc for doc in documents if not dedup.is_duplicate(doc)]
 
     removed = len(documents) - len(unique)
     if removed:
@@ -234,60 +363,289 @@ def deduplicate(documents: list[dict]) -> list[dict]:
 # Public API
 # ---------------------------------------------------------------------------
 
+# Files at least this large are memory-mapped for parsing
+_MMAP_MIN_BYTES = 1 << 20
+
+
 def process_forum_file(
     input_path: Path,
     min_quality: float = 0.1,
 ) -> list[dict]:
     """Process a single forum JSON file into normalized documents."""
-    with open(input_path) as f:
-        data = json.load(f)
+    with open(input_path, "rb") as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+            # Parse straight from the page cache — no copy into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                data = orjson.loads(view)
+        else:
+            raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     # Handle both single thread and array of threads
     threads = data if isinstance(data, list) else [data]
 
     documents: list[dict] = []
     for thread in threads:
-        doc = normalize_thread(thread)
+        doc = normalize_thread(thread, min_quality=min_quality)
         if doc is None:
             continue
-        if doc["quality_score"] < min_quality:
-            logger.debug("Skipping low-quality thread: %s (%.2f)", doc["title"][:50], doc["quality_score"])
-            continue
         documents.append(doc)
 
     return documents
 
 
-def process_forum_directory(
+def _process_forum_file_safe(
+    input_path: Path,
+    min_quality: float,
+) -> tuple[list[dict], str | None]:
+    """Worker wrapper: return (documents, error) instead of raising."""
+    try:
+        return process_forum_file(input_path, min_quality), None
+    except (json.JSONDecodeError, KeyError) as exc:
+        return [], str(exc)
+
+
+def write_jsonl(documents: list[dict], output_jsonl: Path) -> None:
+    """Write documents as JSONL (orjson bytes when available)."""
+    with open(output_jsonl, "wb", buffering=1 << 20) as f:
+        if orjson is not None:
+            f.writelines(orjson.dumps(doc) + b"\n" for doc in documents)
+        else:
+            f.writelines((json.dumps(doc) + "\n").encode() for doc in documents)
+
+
+# Fingerprint of this module's code: cached docs from an older processor
+# version never match, so normalization changes take effect on the next run
+_CODE_VERSION = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
+
+class _CacheDB:
+    """Sidecar SQLite cache of normalized docs per input file.
+
+    Entries are keyed by path and only reused while the file's mtime,
+    size, the min_quality threshold and the processor code are unchanged.
+    Delete the file to invalidate everything.
+    """
+
+    # Bumped when the table layout changes; older cache files are reset
+    _SCHEMA_VERSION = 2
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        path        TEXT PRIMARY KEY,
+        mtime       REAL NOT NULL,
+        size        INTEGER NOT NULL,
+        min_quality REAL NOT NULL,
+        version     TEXT NOT NULL,
+        payload     BLOB NOT NULL
+    )
+    """
+    _MATCH = "path = ? AND mtime = ? AND size = ? AND min_quality = ? AND version = ?"
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != self._SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+        self._conn.execute(self._SCHEMA)
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _key(path: Path, st: os.stat_result, min_quality: float) -> tuple:
+        return (str(path), st.st_mtime, st.st_size, min_quality, _CODE_VERSION)
+
+    def has(self, path: Path, st: os.stat_result, min_quality: float) -> bool:
+        """Whether a valid entry exists, without loading its payload."""
+        row = self._conn.execute(
+            f"SELECT 1 FROM files WHERE {self._MATCH}", self._key(path, st, min_quality)
+        ).fetchone()
+        return row is not None
+
+    def get(self, path: Path, st: os.stat_result, min_quality: float) -> list[dict] | None:
+        row = self._conn.execute(
+            f"SELECT payload FROM files WHERE {self._MATCH}", self._key(path, st, min_quality)
+        ).fetchone()
+        if row is None:
+            return None
+        return orjson.loads(row[0]) if orjson is not None else json.loads(row[0])
+
+    def put(self, path: Path, st: os.stat_result, min_quality: float, docs: list[dict]) -> None:
+        payload = orjson.dumps(docs) if orjson is not None else json.dumps(docs).encode()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime, size, min_quality, version, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*self._key(path, st, min_quality), payload),
+        )
+
+
+def _windowed_map(
+    ex: Executor,
+    paths: list[Path],
+    min_quality: float,
+    window: int,
+) -> Iterator[tuple[list[dict], str | None]]:
+    """:func:`_process_forum_file_safe` over *paths* in order, at most *window* files ahead."""
+    it = iter(paths)
+    pending: deque[Future] = deque(
+        ex.submit(_process_forum_file_safe, p, min_quality) for p in islice(it, window)
+    )
+    while pending:
+        result = pending.popleft().result()
+        # Refill only as results are taken, so a slow consumer bounds memory
+        p = next(it, None)
+        if p is not None:
+            pending.append(ex.submit(_process_forum_file_safe, p, min_quality))
+        yield result
+
+
+def _iter_file_results(
+    paths: list[Path],
+    min_quality: float,
+    workers: int,
+    cache: _CacheDB | None,
+) -> Iterator[tuple[Path, list[dict], str | None]]:
+    """Yield (path, docs, error) per file in path order.
+
+    Cache hits are found up front but their docs are only loaded as each
+    one is yielded; misses go through a process pool when worthwhile.  At
+    most a few files per worker are in flight or waiting to be consumed,
+    so memory stays bounded when the consumer is slower.
+    """
+    stats = [p.stat() for p in paths] if cache else []
+    hits: set[int] = set()
+    if cache:
+        hits = {
+            i for i, (path, st) in enumerate(zip(paths, stats, strict=True))
+            if cache.has(path, st, min_quality)
+        }
+        if hits:
+            logger.info("Reusing cached results for %d/%d files", len(hits), len(paths))
+
+    todo = [p for i, p in enumerate(paths) if i not in hits]
+    with ExitStack() as stack:
+        if workers > 1 and len(todo) > 1:
+            n = min(workers, len(todo))
+            ex = stack.enter_context(ProcessPoolExecutor(max_workers=n))
+            fresh = _windowed_map(ex, todo, min_quality, window=4 * n)
+        else:
+            fresh = (_process_forum_file_safe(p, min_quality) for p in todo)
+
+        for i, path in enumerate(paths):
+            if i in hits:
+                docs = cache.get(path, stats[i], min_quality)
+                if docs is not None:
+                    yield path, docs, None
+                    continue
+                # Entry vanished since the lookup; process the file here
+                docs, error = _process_forum_file_safe(path, min_quality)
+            else:
+                docs, error = next(fresh)
+            if cache and error is None:
+                cache.put(path, stats[i], min_quality, docs)
+            yield path, docs, error
+
+
+def stream_forum_directory(
     input_dir: Path,
     output_jsonl: Path,
     min_quality: float = 0.1,
-) -> list[dict]:
-    """Process all forum JSON files in a directory."""
-    all_docs: list[dict] = []
+    workers: int | None = None,
+    cache_path: Path | None = None,
+) -> int:
+    """Process all forum JSON files in a directory, holding little in memory.
+
+    Files are parsed and normalized in a process pool (*workers* defaults
+    to the CPU count; 1 processes serially).  Results are consumed in
+    sorted path order, so output is independent of the worker count.
+
+    Normalized docs are deduplicated incrementally (see
+    :class:`_Deduplicator`) and streamed to a temporary JSONL; only a
+    (quality, offset, length) index is kept for the best-first sort,
+    after which the lines are copied into *output_jsonl* and the temp
+    file is removed.
+
+    If *cache_path* is given, per-file results are cached there and files
+    whose mtime and size (and the processor code) are unchanged since the
+    last run are skipped.
+
+    Returns:
+        Number of documents written
+    """
+    paths = sorted(input_dir.glob("**/*.json"))
+    workers = workers or os.cpu_count() or 1
+    dumps = orjson.dumps if orjson is not None else (lambda d: json.dumps(d).encode())
+
+    output_jsonl.parent.mkdir(parents=True, exist_ok=True)
+    unsorted_tmp = output_jsonl.with_name(output_jsonl.name + ".unsorted.tmp")
+    sorted_tmp = output_jsonl.with_name(output_jsonl.name + ".tmp")
+
+    dedup = _Deduplicator()
+    index: list[tuple[float, int, int]] = []
+    removed = 0
+
+    cache = _CacheDB(cache_path) if cache_path is not None else None
+    try:
+        with open(unsorted_tmp, "wb", buffering=1 << 20) as out:
+            offset = 0
+            for json_path, docs, error in _iter_file_results(paths, min_quality, workers, cache):
+                if error is not None:
+                    logger.warning("Skipping %s: %s", json_path.name, error)
+                    continue
+                logger.info("  %s: %d documents", json_path.name, len(docs))
+                for doc in docs:
+                    if dedup.is_duplicate(doc):
+                        removed += 1
+                        continue
+                    line = dumps(doc) + b"\n"
+                    out.write(line)
+                    index.append((doc.get("quality_score", 0), offset, len(line)))
+                    offset += len(line)
+    finally:
+        if cache:
+            cache.close()
 
-    for json_path in sorted(input_dir.glob("**/*.json")):
-        try:
-            docs = process_forum_file(json_path, min_quality)
-            all_docs.extend(docs)
-            logger.info("  %s: %d documents", json_path.name, len(docs))
-        except (json.JSONDecodeError, KeyError) as exc:
-            logger.warning("Skipping %s: %s", json_path.name, exc)
+    if removed:
+        logger.info("Deduplicated: removed %d duplicates", removed)
 
-    # Deduplicate
-    all_docs = deduplicate(all_docs)
+    # Sort by quality (best first); stable, so ties keep input order
+    index.sort(key=lambda entry: entry[0], reverse=True)
 
-    # Sort by quality (best first)
-    all_docs.sort(key=lambda d: d.get("quality_score", 0), reverse=True)
+    with open(unsorted_tmp, "rb") as src, open(sorted_tmp, "wb", buffering=1 << 20) as dst:
+        for _, offset, length in index:
+            src.seek(offset)
+            dst.write(src.read(length))
+    os.replace(sorted_tmp, output_jsonl)
+    unsorted_tmp.unlink()
+
+    logger.info("Wrote %d documents to %s", len(index), output_jsonl)
+    return len(index)
 
-    # Write output
-    output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_jsonl, "w") as f:
-        for doc in all_docs:
-            f.write(json.dumps(doc) + "\n")
 
-    logger.info("Wrote %d documents to %s", len(all_docs), output_jsonl)
-    return all_docs
+def process_forum_directory(
+    input_dir: Path,
+    output_jsonl: Path,
+    min_quality: float = 0.1,
+    workers: int | None = None,
+    cache_path: Path | None = None,
+) -> list[dict]:
+    """Process all forum JSON files in a directory and return the documents.
+
+    Runs :func:`stream_forum_directory`, then reads *output_jsonl* back.
+    Callers that only need the count should use the streaming function.
+    """
+    stream_forum_directory(input_dir, output_jsonl, min_quality, workers, cache_path)
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(output_jsonl, "rb") as f:
+        return [_intern_doc(loads(line)) for line in f]
 
 
 # ---------------------------------------------------------------------------
@@ -302,6 +660,8 @@ def main():
     parser.add_argument("-o", "--output", type=Path, default=None, help="Output JSONL path")
     parser.add_argument("--min-score", type=float, default=0.1, help="Minimum quality score (0.0-1.0)")
     parser.add_argument("--vehicle", default="fzj80", help="Vehicle type code")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="Sidecar SQLite cache; unchanged input files are skipped")
     args = parser.parse_args()
 
     if not args.input.exists():
@@ -312,13 +672,11 @@ def main():
     output = args.output or project_root / "data" / f"{args.vehicle}_forum.jsonl"
 
     if args.input.is_dir():
-        docs = process_forum_directory(args.input, output, args.min_score)
+        docs = process_forum_directory(args.input, output, args.min_score, cache_path=args.cache)
     else:
         docs = process_forum_file(args.input, args.min_score)
         output.parent.mkdir(parents=True, exist_ok=True)
-        with open(output, "w") as f:
-            for doc in docs:
-                f.write(json.dumps(doc) + "\n")
+        write_jsonl(docs, output)
 
     print(f"Processed {len(docs)} documents -> {output}")
 
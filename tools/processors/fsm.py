@@ -16,13 +16,41 @@ import argparse
 import hashlib
 import json
 import logging
+import os
 import re
+import tempfile
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterator
+from typing import BinaryIO, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional speedup for JSONL output
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Scanned pages per Tesseract run; batching amortizes engine start-up
+# (kept well under ~50, where pytesseract's batch mode can stall)
+_OCR_BATCH_PAGES = 8
+
+# OCR render resolution.  Pages with some native text are mostly diagrams
+# with captions and read fine at the lower DPI (2.25x fewer pixels);
+# pages with next to none are full scans and get the higher one.
+_OCR_DPI = 300
+_OCR_DPI_PARTIAL = 200
+_OCR_PARTIAL_CHARS = 20
+
+# A page rendered for OCR: (width, height, 8-bit grayscale samples)
+_GrayPage = tuple[int, int, bytes]
+
 # ---------------------------------------------------------------------------
 # Section classification
 # ---------------------------------------------------------------------------
@@ -47,9 +75,19 @@ _HEADING_CATEGORY_MAP: list[tuple[re.Pattern, str]] = [
 ]
 
 
+# Consecutive patterns for the same category fused into one alternation:
+# one regex search per category instead of per pattern, and since only
+# adjacent entries merge, the map's priority order is unchanged.
+_HEADING_CATEGORY_FUSED: list[tuple[re.Pattern, str]] = [
+    (re.compile("|".join(pattern.pattern for pattern, _ in group), re.I), category)
+    for category, group in groupby(_HEADING_CATEGORY_MAP, key=itemgetter(1))
+]
+
+
+@lru_cache(maxsize=2048)
 def classify_section(heading: str) -> str:
     """Return the ChromaDB category for an FSM section heading."""
-    for pattern, category in _HEADING_CATEGORY_MAP:
+    for pattern, category in _HEADING_CATEGORY_FUSED:
         if pattern.search(heading):
             return category
     return "general"
@@ -72,22 +110,42 @@ class FSMSection:
     heading: str
     category: str
     pages: list[FSMPage] = field(default_factory=list)
+    # A plain attribute rather than functools.cached_property, which needs an
+    # instance __dict__ that mypyc-compiled classes don't have.  Set in
+    # __post_init__: compiled dataclasses skip defaults of init=False fields.
+    _text: str | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._text = None
 
     @property
     def text(self) -> str:
-        return "\n\n".join(p.text for p in self.pages if p.text.strip())
+        # Joined once on first access; read only after grouping is complete
+        if self._text is None:
+            self._text = "\n\n".join(p.text for p in self.pages if p.text.strip())
+        return self._text
 
 
 # ---------------------------------------------------------------------------
 # PDF extraction
 # ---------------------------------------------------------------------------
 
-def extract_pages(pdf_path: Path, ocr_threshold: int = 50) -> list[FSMPage]:
+def extract_pages(
+    pdf_path: Path,
+    ocr_threshold: int = 50,
+    ocr_workers: int | None = None,
+) -> list[FSMPage]:
     """Extract text from a PDF, falling back to OCR for scanned pages.
 
+    Pages are rendered in this process (a fitz document can't be shared
+    across processes); the rendered images are OCR'd in a process pool
+    and the results are merged back in page order.
+
     Args:
         pdf_path: Path to the PDF file.
         ocr_threshold: Minimum characters of native text before OCR is tried.
+        ocr_workers: OCR worker processes (default: CPU count; 1 runs OCR
+            in this process).
 
     Returns:
         List of FSMPage objects.
@@ -98,30 +156,78 @@ def extract_pages(pdf_path: Path, ocr_threshold: int = 50) -> list[FSMPage]:
         logger.error("PyMuPDF (fitz) is required. Install with: pip install pymupdf")
         raise
 
-    pages: list[FSMPage] = []
-    doc = fitz.open(str(pdf_path))
-
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text("text").strip()
-        is_ocr = False
-
-        # If native text is too short, try OCR
-        if len(text) < ocr_threshold:
-            ocr_text = _ocr_page(page)
-            if ocr_text and len(ocr_text) > len(text):
-                text = ocr_text
-                is_ocr = True
-
-        if text:
-            pages.append(FSMPage(
-                page_num=page_num + 1,
-                text=text,
-                heading=_extract_heading(text),
-                is_ocr=is_ocr,
-            ))
-
-    doc.close()
+    ocr_workers = ocr_workers or os.cpu_count() or 1
+    can_ocr = _ocr_available()
+
+    # (page_num, native text, (batch, index in batch) if OCR'd), in page order
+    slots: list[tuple[int, str, tuple[int, int] | None]] = []
+    ocr_batches: list[Future] = []
+
+    with ExitStack() as stack:
+        doc = fitz.open(str(pdf_path))
+        stack.callback(doc.close)
+        pool: ProcessPoolExecutor | None = None  # started on the first scanned page; digital PDFs never need it
+        # Cap rendered-but-unOCR'd pages so big scanned manuals don't pile up
+        # in memory: at most ocr_workers + 1 submitted batches (one per worker
+        # plus one queued, i.e. (ocr_workers + 1) * _OCR_BATCH_PAGES pages)
+        # on top of the batch being filled
+        in_flight: deque[Future] = deque()
+        batch: list[_GrayPage] = []
+
+        def submit_batch() -> None:
+            nonlocal pool
+            if ocr_workers > 1:
+                if pool is None:
+                    pool = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=ocr_workers, initializer=_init_ocr_worker,
+                    ))
+                future = pool.submit(_ocr_batch, list(batch))
+                in_flight.append(future)
+                while len(in_flight) > ocr_workers + 1:
+                    in_flight.popleft().result()
+            else:
+                future = Future()
+                future.set_result(_ocr_batch(batch))
+            ocr_batches.append(future)
+            batch.clear()
+
+        # Text extraction stays on this thread: PyMuPDF holds the GIL and a
+        # document must not be used from several threads.  Submitted OCR
+        # batches run in the pool while later pages are extracted here.
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            text = page.get_text("text").strip()
+            ocr_ref = None
+
+            # If native text is too short, try OCR
+            if can_ocr and len(text) < ocr_threshold:
+                dpi = _OCR_DPI_PARTIAL if len(text) > _OCR_PARTIAL_CHARS else _OCR_DPI
+                image = _render_gray(page, dpi)
+                if image is not None:
+                    ocr_ref = (len(ocr_batches), len(batch))
+                    batch.append(image)
+                    if len(batch) == _OCR_BATCH_PAGES:
+                        submit_batch()
+
+            slots.append((page_num, text, ocr_ref))
+
+        if batch:
+            submit_batch()
+
+        pages: list[FSMPage] = []
+        for page_num, text, ocr_ref in slots:
+            is_ocr = False
+            if ocr_ref is not None:
+                batch_no, idx = ocr_ref
+                ocr_text = ocr_batches[batch_no].result()[idx]
+                if ocr_text and len(ocr_text) > len(text):
+                    text = ocr_text
+                    is_ocr = True
+
+            if text:
+                pages.append(FSMPage(page_num=page_num + 1, text=text, is_ocr=is_ocr))
+
+    _assign_headings(pages)
     logger.info(
         "Extracted %d pages from %s (%d OCR)",
         len(pages),
@@ -131,68 +237,148 @@ def extract_pages(pdf_path: Path, ocr_threshold: int = 50) -> list[FSMPage]:
     return pages
 
 
-def _ocr_page(page) -> str:
-    """Run Tesseract OCR on a PDF page rendered as an image."""
+def _ocr_available() -> bool:
+    """Return True if pytesseract and PIL can be imported."""
+    try:
+        import pytesseract  # noqa: F401
+        from PIL import Image  # noqa: F401
+    except ImportError:
+        logger.debug("pytesseract/PIL not available, skipping OCR")
+        return False
+    return True
+
+
+def _render_gray(page, dpi: int = _OCR_DPI) -> _GrayPage | None:
+    """Render a PDF page at *dpi* as raw 8-bit grayscale for OCR.
+
+    Raw samples skip the PNG encode/decode round trip, and grayscale is a
+    third of the RGB bytes with nothing lost for OCR of FSM line art.
+    """
+    try:
+        import fitz
+
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        return pix.width, pix.height, pix.samples
+    except Exception as exc:
+        logger.debug("Render failed for page: %s", exc)
+        return None
+
+
+def _init_ocr_worker() -> None:
+    """Keep each Tesseract to one thread; the pool already uses every core."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_batch(images: list[_GrayPage]) -> list[str]:
+    """OCR several rendered pages with a single Tesseract run.
+
+    The pages are written to a temp dir as binary PGM (a header plus the
+    raw samples, no compression) and Tesseract is pointed at a text file
+    listing them, so its engine start-up is paid once per batch.  It
+    separates the pages' text with form feeds.  Falls back to one run per
+    page if the batch fails or the page count doesn't line up.
+
+    Top-level so it can be pickled into OCR worker processes.
+    """
+    if len(images) > 1:
+        try:
+            import pytesseract
+
+            with tempfile.TemporaryDirectory(prefix="fsm_ocr_") as tmp:
+                tmpdir = Path(tmp)
+                image_paths = []
+                for i, (width, height, samples) in enumerate(images):
+                    image_path = tmpdir / f"p{i}.pgm"
+                    with open(image_path, "wb") as f:
+                        f.write(b"P5\n%d %d\n255\n" % (width, height))
+                        f.write(samples)
+                    image_paths.append(str(image_path))
+                list_txt = tmpdir / "list.txt"
+                list_txt.write_text("\n".join(image_paths) + "\n")
+                text = pytesseract.image_to_string(str(list_txt), lang="eng")
+
+            parts = text.split("\x0c")
+            if len(parts) == len(images) + 1 and not parts[-1].strip():
+                parts.pop()  # trailing separator after the last page
+            if len(parts) == len(images):
+                return [part.strip() for part in parts]
+            logger.debug("OCR batch returned %d pages for %d images", len(parts), len(images))
+        except Exception as exc:
+            logger.debug("Batch OCR failed: %s", exc)
+
+    return [_ocr_image(image) for image in images]
+
+
+def _ocr_image(image: _GrayPage) -> str:
+    """Run Tesseract OCR on one page rendered by :func:`_render_gray`."""
     try:
         import pytesseract
         from PIL import Image
-        import io
 
-        # Render page at 300 DPI
-        pix = page.get_pixmap(dpi=300)
-        img = Image.open(io.BytesIO(pix.tobytes("png")))
+        width, height, samples = image
+        img = Image.frombytes("L", (width, height), samples)
         text = pytesseract.image_to_string(img, lang="eng")
         return text.strip()
-    except ImportError:
-        logger.debug("pytesseract/PIL not available, skipping OCR")
-        return ""
     except Exception as exc:
         logger.debug("OCR failed for page: %s", exc)
         return ""
 
 
-def _extract_heading(text: str) -> str:
-    """Try to extract the first heading-like line from page text."""
-    for line in text.split("\n")[:5]:
-        line = line.strip()
-        # FSM headings are typically ALL CAPS or have section numbers
-        if re.match(r"^[A-Z][A-Z\s\-/]{5,}$", line):
-            return line
-        if re.match(r"^\d{1,2}[\.\-]\d{1,2}\s+\w", line):
-            return line
-    return ""
+# FSM headings are typically ALL CAPS or have section numbers.  Both forms
+# in one pattern, matched line by line (re.M) over a whole document's
+# candidate lines; [^\S\n] is \s that can't run onto the next line.
+_HEADING_LINE_RE = re.compile(
+    r"^(?:[A-Z](?:[^\S\n]|[A-Z\-/]){5,}$|\d{1,2}[.\-]\d{1,2}[^\S\n]+\w.*)",
+    re.M,
+)
+
+
+def _assign_headings(pages: list[FSMPage]) -> None:
+    """Set each page's heading to its first heading-like line.
+
+    Only a page's first five lines are candidates.  They are stripped and
+    joined for the whole document so a single ``finditer`` scan finds
+    every page's heading; match offsets map back to pages by bisecting
+    the cumulative start offsets.
+    """
+    blocks: list[str] = []
+    starts: list[int] = []
+    offset = 0
+    for page in pages:
+        block = "\n".join(line.strip() for line in page.text.split("\n", 5)[:5])
+        starts.append(offset)
+        blocks.append(block)
+        offset += len(block) + 1
+
+    last = -1
+    for m in _HEADING_LINE_RE.finditer("\n".join(blocks)):
+        i = bisect_right(starts, m.start()) - 1
+        if i != last:  # first match on a page wins
+            pages[i].heading = m.group()
+            last = i
 
 
 # ---------------------------------------------------------------------------
 # Section grouping
 # ---------------------------------------------------------------------------
 
+def _with_running_heading(pages: list[FSMPage]) -> Iterator[tuple[str, FSMPage]]:
+    """Pair each page with its heading, inheriting the last one seen."""
+    heading = "General"
+    for page in pages:
+        heading = page.heading or heading
+        yield heading, page
+
+
 def group_into_sections(pages: list[FSMPage]) -> list[FSMSection]:
     """Group pages into sections based on heading changes."""
-    if not pages:
-        return []
-
     sections: list[FSMSection] = []
-    current_heading = pages[0].heading or "General"
-    current_section = FSMSection(
-        heading=current_heading,
-        category=classify_section(current_heading),
-    )
-
-    for page in pages:
-        if page.heading and page.heading != current_heading:
-            if current_section.pages:
-                sections.append(current_section)
-            current_heading = page.heading
-            current_section = FSMSection(
-                heading=current_heading,
-                category=classify_section(current_heading),
-            )
-        current_section.pages.append(page)
-
-    if current_section.pages:
-        sections.append(current_section)
-
+    for heading, group in groupby(_with_running_heading(pages), key=itemgetter(0)):
+        sections.append(FSMSection(
+            heading=heading,
+            category=classify_section(heading),
+            pages=[page for _, page in group],
+        ))
     return sections
 
 
@@ -246,21 +432,33 @@ def sections_to_documents(
             }
 
 
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+
+
 def _split_long_text(text: str, max_len: int) -> list[str]:
     """Split long text at paragraph boundaries."""
-    paragraphs = re.split(r"\n{2,}", text)
+    paragraphs = _BLANK_LINES_RE.split(text)
     parts: list[str] = []
-    current = ""
+    # Paragraphs of the part being built, and the length of their
+    # "\n\n"-joined text; joined once per part instead of on every append
+    buf: list[str] = []
+    buf_len = 0
 
     for para in paragraphs:
-        if len(current) + len(para) + 2 > max_len and current:
-            parts.append(current.strip())
-            current = para
+        if buf_len and buf_len + len(para) + 2 > max_len:
+            parts.append("\n\n".join(buf).strip())
+            buf = [para]
+            buf_len = len(para)
+        elif buf_len:
+            buf.append(para)
+            buf_len += len(para) + 2
         else:
-            current = current + "\n\n" + para if current else para
+            buf = [para]
+            buf_len = len(para)
 
-    if current.strip():
-        parts.append(current.strip())
+    current = "\n\n".join(buf).strip()
+    if current:
+        parts.append(current)
 
     return parts if parts else [text[:max_len]]
 
@@ -273,38 +471,81 @@ def process_pdf(
     pdf_path: Path,
     vehicle_type: str = "fzj80",
     output_jsonl: Path | None = None,
+    ocr_workers: int | None = None,
 ) -> list[dict]:
     """Process a single FSM PDF into document dicts.
 
     Returns the list of documents.  If *output_jsonl* is provided, also
     appends to that file.
     """
-    pages = extract_pages(pdf_path)
+    pages = extract_pages(pdf_path, ocr_workers=ocr_workers)
     sections = group_into_sections(pages)
     documents = list(sections_to_documents(sections, pdf_path.stem, vehicle_type))
 
     if output_jsonl:
         output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_jsonl, "a") as f:
-            for doc in documents:
-                f.write(json.dumps(doc) + "\n")
+        with open(output_jsonl, "ab", buffering=1 << 20) as f:
+            _write_jsonl(f, documents)
         logger.info("Appended %d documents to %s", len(documents), output_jsonl)
 
     return documents
 
 
+def _write_jsonl(f: BinaryIO, documents: list[dict]) -> None:
+    """Write *documents* to a binary file, one JSON object per line."""
+    if orjson is not None:
+        f.writelines(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in documents)
+    else:
+        f.writelines((json.dumps(doc) + "\n").encode() for doc in documents)
+
+
 def process_directory(
     pdf_dir: Path,
     vehicle_type: str = "fzj80",
     output_jsonl: Path | None = None,
+    ocr_workers: int | None = None,
+    workers: int | None = None,
 ) -> list[dict]:
-    """Process all PDFs in a directory."""
+    """Process all PDFs in a directory.
+
+    PDFs are independent, so they are processed in a process pool
+    (*workers* defaults to the CPU count, capped at the number of PDFs).
+    Only one level of processes is used: unless *ocr_workers* is given,
+    OCR runs inside each PDF worker, or in a full-size OCR pool when there
+    is only one PDF worker.  Workers only return documents; this process
+    appends them to *output_jsonl* in sorted PDF order, so writes never
+    interleave.
+    """
+    pdfs = sorted(pdf_dir.glob("*.pdf"))
+    if not pdfs:
+        return []
+
+    cpus = os.cpu_count() or 1
+    workers = min(len(pdfs), workers or cpus)
+    if ocr_workers is None:
+        ocr_workers = 1 if workers > 1 else cpus
+    process_one = partial(process_pdf, vehicle_type=vehicle_type, ocr_workers=ocr_workers)
+
     all_docs: list[dict] = []
-    for pdf_path in sorted(pdf_dir.glob("*.pdf")):
-        logger.info("Processing: %s", pdf_path.name)
-        docs = process_pdf(pdf_path, vehicle_type, output_jsonl)
-        all_docs.extend(docs)
-        logger.info("  -> %d documents", len(docs))
+    with ExitStack() as stack:
+        out = None
+        if output_jsonl:
+            # One buffered handle for the whole scan rather than one per PDF
+            output_jsonl.parent.mkdir(parents=True, exist_ok=True)
+            out = stack.enter_context(open(output_jsonl, "ab", buffering=1 << 20))
+        if workers > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = pool.map(process_one, pdfs)
+        else:
+            results = map(process_one, pdfs)
+
+        for pdf_path, docs in zip(pdfs, results, strict=True):
+            logger.info("Processed: %s -> %d documents", pdf_path.name, len(docs))
+            if out is not None:
+                _write_jsonl(out, docs)
+            all_docs.extend(docs)
+    if output_jsonl:
+        logger.info("Appended %d documents to %s", len(all_docs), output_jsonl)
     return all_docs
 
 
@@ -312,13 +553,15 @@ def process_directory(
 # CLI
 # ---------------------------------------------------------------------------
 
-def main():
+def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     parser = argparse.ArgumentParser(description="Process FSM PDFs into JSONL for RigSherpa KB")
     parser.add_argument("input", type=Path, help="PDF file or directory of PDFs")
     parser.add_argument("-o", "--output", type=Path, default=None, help="Output JSONL path")
     parser.add_argument("--vehicle", default="fzj80", help="Vehicle type code")
+    parser.add_argument("--ocr-workers", type=int, default=None,
+                        help="OCR worker processes (default: CPU count; 1 = no pool)")
     args = parser.parse_args()
 
     if not args.input.exists():
@@ -329,9 +572,9 @@ def main():
     output = args.output or project_root / "data" / f"{args.vehicle}_fsm.jsonl"
 
     if args.input.is_dir():
-        docs = process_directory(args.input, args.vehicle, output)
+        docs = process_directory(args.input, args.vehicle, output, args.ocr_workers)
     else:
-        docs = process_pdf(args.input, args.vehicle, output)
+        docs = process_pdf(args.input, args.vehicle, output, args.ocr_workers)
 
     print(f"Processed {len(docs)} documents -> {output}")
 
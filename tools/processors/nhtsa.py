@@ -14,6 +14,22 @@ import argparse
 import json
 import logging
 from pathlib import Path
+from typing import Iterator
+
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON parsing/writing
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional streaming parser for very large dumps
+    ijson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional automaton for partial component matches
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
@@ -46,37 +62,94 @@ _COMPONENT_CATEGORY: dict[str, str] = {
 }
 
 
+# Partial matching: the first table entry (in order) that contains, or is
+# contained in, the component wins.  Names inside the component are found
+# with one Aho-Corasick scan (or a loop without pyahocorasick); the
+# component inside a name is one lookup in a table of every substring of
+# every name, mapped to the first name holding it.
+_COMPONENT_NAMES: list[str] = list(_COMPONENT_CATEGORY)
+
+
+def _build_name_substrings(names: list[str]) -> dict[str, int]:
+    substrings: dict[str, int] = {}
+    for i, name in enumerate(names):
+        for start in range(len(name) + 1):
+            for end in range(start, len(name) + 1):
+                substrings.setdefault(name[start:end], i)
+    return substrings
+
+
+def _build_name_automaton(names: list[str]):
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for i, name in enumerate(names):
+        automaton.add_word(name, i)
+    automaton.make_automaton()
+    return automaton
+
+
+_NAME_SUBSTRINGS = _build_name_substrings(_COMPONENT_NAMES)
+_NAME_AUTOMATON = _build_name_automaton(_COMPONENT_NAMES)
+
+
 def _component_to_category(component: str) -> str:
     """Map an NHTSA component name to a ChromaDB category."""
     key = component.strip().upper()
     if key in _COMPONENT_CATEGORY:
         return _COMPONENT_CATEGORY[key]
+
     # Partial match
-    for nhtsa_name, cat in _COMPONENT_CATEGORY.items():
-        if nhtsa_name in key or key in nhtsa_name:
-            return cat
+    best = _NAME_SUBSTRINGS.get(key, len(_COMPONENT_NAMES))
+    if _NAME_AUTOMATON is not None:
+        for _, i in _NAME_AUTOMATON.iter(key):
+            best = min(best, i)
+    else:
+        for i, nhtsa_name in enumerate(_COMPONENT_NAMES[:best]):
+            if nhtsa_name in key:
+                best = i
+                break
+    if best < len(_COMPONENT_NAMES):
+        return _COMPONENT_CATEGORY[_COMPONENT_NAMES[best]]
     return "general"
 
 
+# Dumps at least this large are streamed item by item (needs ijson)
+_STREAM_MIN_BYTES = 64 << 20
+
+
+def _iter_results(json_file: Path) -> Iterator[dict]:
+    """Yield the items of an NHTSA dump's ``results`` array.
+
+    Multi-GB dumps are streamed with ijson when it is installed, so only
+    one item is in memory at a time; smaller files are parsed whole.
+    """
+    if ijson is not None and json_file.stat().st_size >= _STREAM_MIN_BYTES:
+        with open(json_file, "rb") as f:
+            yield from ijson.items(f, "results.item", use_float=True)
+        return
+    raw = json_file.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    yield from data.get("results", [])
+
+
 def _process_recalls(raw_path: Path) -> list[dict]:
     """Process recall JSON files into JSONL documents."""
     docs: list[dict] = []
     seen_ids: set[str] = set()
 
     for json_file in sorted(raw_path.glob("*_recalls.json")):
-        with open(json_file) as f:
-            data = json.load(f)
-
-        for item in data.get("results", []):
-            nhtsa_id = item.get("NHTSACampaignNumber", "")
+        for item in _iter_results(json_file):
+            get = item.get  # bound once; several lookups per record
+            nhtsa_id = get("NHTSACampaignNumber", "")
             if not nhtsa_id or nhtsa_id in seen_ids:
                 continue
             seen_ids.add(nhtsa_id)
 
-            component = item.get("Component", "")
-            summary = item.get("Summary", "")
-            consequence = item.get("Consequence", "")
-            remedy = item.get("Remedy", "")
+            component = get("Component", "")
+            summary = get("Summary", "")
+            consequence = get("Consequence", "")
+            remedy = get("Remedy", "")
 
             content_parts = [
                 f"NHTSA Recall {nhtsa_id}",
@@ -95,13 +168,13 @@ def _process_recalls(raw_path: Path) -> list[dict]:
                 "content": "\n".join(content_parts),
                 "category": "tsb",
                 "url": "",
-                "date": item.get("ReportReceivedDate", ""),
+                "date": get("ReportReceivedDate", ""),
                 "quality_score": 1.0,
                 "metadata": {
                     "vehicle_type": "fzj80",
                     "nhtsa_type": "recall",
                     "component": component,
-                    "model_year": item.get("ModelYear", ""),
+                    "model_year": get("ModelYear", ""),
                 },
             })
 
@@ -126,29 +199,28 @@ def _process_complaints(raw_path: Path) -> list[dict]:
     seen_ids: set[str] = set()
 
     for json_file in sorted(raw_path.glob("*_complaints.json")):
-        with open(json_file) as f:
-            data = json.load(f)
-
-        for item in data.get("results", []):
-            odi_number = str(item.get("odiNumber", ""))
+        for item in _iter_results(json_file):
+            get = item.get  # bound once; several lookups per record
+            odi_number = str(get("odiNumber", ""))
             if not odi_number or odi_number in seen_ids:
                 continue
             seen_ids.add(odi_number)
 
-            component = item.get("components", "")
-            summary = item.get("summary", "")
+            component = get("components", "")
+            summary = get("summary", "")
+            model_year = get("modelYear", "")
             category = _component_to_category(component)
 
             content_parts = [
                 f"NHTSA Complaint {odi_number}",
                 f"Component: {component}",
-                f"Year: {item.get('modelYear', '')}",
+                f"Year: {model_year}",
                 f"Summary: {summary}",
             ]
 
-            crash = item.get("crash", "N")
-            injury = item.get("injuries", "N")
-            fire = item.get("fire", "N")
+            crash = get("crash", "N")
+            injury = get("injuries", "N")
+            fire = get("fire", "N")
             if crash == "Y":
                 content_parts.append("Crash reported: Yes")
             if injury == "Y":
@@ -163,13 +235,13 @@ def _process_complaints(raw_path: Path) -> list[dict]:
                 "content": "\n".join(content_parts),
                 "category": category,
                 "url": "",
-                "date": item.get("dateComplaintFiled", ""),
+                "date": get("dateComplaintFiled", ""),
                 "quality_score": _quality_from_complaint(item),
                 "metadata": {
                     "vehicle_type": "fzj80",
                     "nhtsa_type": "complaint",
                     "component": component,
-                    "model_year": item.get("modelYear", ""),
+                    "model_year": model_year,
                     "crash": crash,
                     "injury": injury,
                     "fire": fire,
@@ -195,9 +267,11 @@ def process_nhtsa(
 
     if output_jsonl:
         output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_jsonl, "w") as f:
-            for doc in all_docs:
-                f.write(json.dumps(doc) + "\n")
+        with open(output_jsonl, "wb", buffering=1 << 20) as f:
+            if orjson is not None:
+                f.writelines(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in all_docs)
+            else:
+                f.writelines((json.dumps(doc) + "\n").encode() for doc in all_docs)
         logger.info("Wrote %d documents to %s", len(all_docs), output_jsonl)
 
     return all_docs
@@ -16,6 +16,11 @@ import logging
 from collections import defaultdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON parsing/writing
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,8 +38,8 @@ def process_parts(
     seen_pn: set[str] = set()
 
     for json_file in sorted(raw_path.glob("*.json")):
-        with open(json_file) as f:
-            data = json.load(f)
+        raw = json_file.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
         for part in data.get("parts", []):
             pn = part.get("part_number", "").strip()
@@ -92,9 +97,11 @@ def process_parts(
 
     if output_jsonl:
         output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_jsonl, "w") as f:
-            for doc in all_docs:
-                f.write(json.dumps(doc) + "\n")
+        with open(output_jsonl, "wb", buffering=1 << 20) as f:
+            if orjson is not None:
+                f.writelines(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in all_docs)
+            else:
+                f.writelines((json.dumps(doc) + "\n").encode() for doc in all_docs)
         logger.info("Wrote %d documents to %s", len(all_docs), output_jsonl)
 
     return all_docs
@@ -13,9 +13,17 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON parsing/writing
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # Heading keyword patterns → category (reuse FSM heading logic)
@@ -31,12 +39,28 @@ _HEADING_CATEGORY: list[tuple[re.Pattern, str]] = [
 ]
 
 
-def _classify_heading(heading: str, fallback: str = "general") -> str:
-    """Classify a section heading into a ChromaDB category."""
+@lru_cache(maxsize=2048)
+def _heading_category(heading: str) -> str | None:
+    """Return the category for *heading*, or None if no pattern matches."""
     for pattern, category in _HEADING_CATEGORY:
         if pattern.search(heading):
             return category
-    return fallback
+    return None
+
+
+def _classify_heading(heading: str, fallback: str = "general") -> str:
+    """Classify a section heading into a ChromaDB category."""
+    # The fallback stays out of the cache key; only the heading lookup is cached
+    return _heading_category(heading) or fallback
+
+
+# Threads reading raw article files concurrently
+_READ_WORKERS = 8
+
+
+def _load_json(path: Path) -> dict:
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def process_web_articles(
@@ -49,68 +73,81 @@ def process_web_articles(
     """
     all_docs: list[dict] = []
 
-    for json_file in sorted(raw_path.glob("*.json")):
-        with open(json_file) as f:
-            data = json.load(f)
-
-        url = data.get("url", "")
-        title = data.get("title", json_file.stem)
-        categories = data.get("categories", ["general"])
-        sections = data.get("sections", [])
-        full_text = data.get("full_text", "")
-
-        if sections:
-            # Split into section-level documents
-            for i, section in enumerate(sections):
-                heading = section.get("heading", "")
-                content = section.get("content", "")
-                if len(content) < 50:
-                    continue
-
-                # Classify section by heading, falling back to article-level category
-                category = _classify_heading(heading, categories[0])
-
-                # Prefix section content with context
-                section_title = f"{title} — {heading}" if heading else title
-                prefixed = f"{section_title}\n\n{content}"
-
+    json_files: list[Path] = []
+    if raw_path.is_dir():
+        with os.scandir(raw_path) as entries:
+            json_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+
+    # Reads overlap in threads (file I/O releases the GIL) with building
+    # docs from earlier files; results come back in sorted order, so
+    # documents are built exactly as before
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        loaded = pool.map(_load_json, json_files)
+
+        for json_file, data in zip(json_files, loaded, strict=True):
+            url = data.get("url", "")
+            title = data.get("title", json_file.stem)
+            categories = data.get("categories", ["general"])
+            sections = data.get("sections", [])
+            full_text = data.get("full_text", "")
+
+            if sections:
+                # Split into section-level documents
+                for i, section in enumerate(sections):
+                    heading = section.get("heading", "")
+                    content = section.get("content", "")
+                    if len(content) < 50:
+                        continue
+
+                    # Classify section by heading, falling back to article-level category
+                    category = _classify_heading(heading, categories[0])
+
+                    # Prefix section content with context
+                    section_title = f"{title} — {heading}" if heading else title
+                    prefixed = f"{section_title}\n\n{content}"
+
+                    all_docs.append({
+                        "source": "web",
+                        "source_id": f"{json_file.stem}_s{i}",
+                        "title": section_title,
+                        "content": prefixed,
+                        "category": category,
+                        "url": url,
+                        "date": "",
+                        "quality_score": 0.7,
+                        "metadata": {
+                            "vehicle_type": "fzj80",
+                            "original_title": title,
+                            "section_heading": heading,
+                        },
+                    })
+            elif full_text and len(full_text) >= 100:
+                # No sections detected — use full text as a single document
                 all_docs.append({
                     "source": "web",
-                    "source_id": f"{json_file.stem}_s{i}",
-                    "title": section_title,
-                    "content": prefixed,
-                    "category": category,
+                    "source_id": json_file.stem,
+                    "title": title,
+                    "content": f"{title}\n\n{full_text}",
+                    "category": categories[0],
                     "url": url,
                     "date": "",
                     "quality_score": 0.7,
-                    "metadata": {
-                        "vehicle_type": "fzj80",
-                        "original_title": title,
-                        "section_heading": heading,
-                    },
+                    "metadata": {"vehicle_type": "fzj80"},
                 })
-        elif full_text and len(full_text) >= 100:
-            # No sections detected — use full text as a single document
-            all_docs.append({
-                "source": "web",
-                "source_id": json_file.stem,
-                "title": title,
-                "content": f"{title}\n\n{full_text}",
-                "category": categories[0],
-                "url": url,
-                "date": "",
-                "quality_score": 0.7,
-                "metadata": {"vehicle_type": "fzj80"},
-            })
 
     logger.info("Web articles: %d documents from %d files",
-                len(all_docs), len(list(raw_path.glob("*.json"))))
+                len(all_docs), len(json_files))
 
     if output_jsonl:
         output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_jsonl, "w") as f:
-            for doc in all_docs:
-                f.write(json.dumps(doc) + "\n")
+        with open(output_jsonl, "wb", buffering=1 << 20) as f:
+            if orjson is not None:
+                f.writelines(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in all_docs)
+            else:
+                f.writelines((json.dumps(doc) + "\n").encode() for doc in all_docs)
         logger.info("Wrote %d documents to %s", len(all_docs), output_jsonl)
 
     return all_docs
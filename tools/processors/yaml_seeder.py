@@ -16,13 +16,30 @@ import argparse
 import hashlib
 import json
 import logging
+import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSONL output
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it; pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed-config cache; bump the version when the pickled layout changes
+YAML_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "yaml"
+_YAML_CACHE_VERSION = 1
+
 # Category mapping: YAML section → ChromaDB collection
 _SECTION_CATEGORY = {
     "engine": "engine",
@@ -42,12 +59,60 @@ _SECTION_CATEGORY = {
 }
 
 
+def _load_yaml(yaml_path: Path) -> dict:
+    # Bytes let the C scanner read UTF-8 directly, skipping text decoding
+    with open(yaml_path, "rb") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def _load_yaml_cached(yaml_path: Path) -> dict:
+    """Load *yaml_path*, reusing a pickled parse of the same file.
+
+    Caches live under ``YAML_CACHE_DIR``, one per config path, keyed on
+    ``_YAML_CACHE_VERSION`` and the file's size and mtime; a missing,
+    stale or unreadable cache just falls back to parsing the YAML.
+    """
+    st = yaml_path.stat()
+    key = (_YAML_CACHE_VERSION, st.st_size, st.st_mtime_ns)
+    path_hash = hashlib.blake2b(str(yaml_path.resolve()).encode(), digest_size=8).hexdigest()
+    cache_path = YAML_CACHE_DIR / f"{yaml_path.stem}-{path_hash}.pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, data = pickle.load(f)
+        if cached_key == key:
+            return data
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+
+    data = _load_yaml(yaml_path)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not write YAML cache %s: %s", cache_path, e)
+    return data
+
+
 def _chunk_id(text: str, prefix: str) -> str:
-    h = hashlib.md5(text.encode()).hexdigest()[:8]
+    h = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
     return f"yaml_{prefix}_{h}"
 
 
+@lru_cache(maxsize=512)
+def _pretty(key: str) -> str:
+    """Turn a snake_case YAML key into a display label."""
+    return key.replace("_", " ").title()
+
+
 def _fmt_value(v) -> str:
+    # Scalars are by far the most common YAML leaves
+    if isinstance(v, str):
+        return v
+    if isinstance(v, (int, float)):
+        return str(v)
     if isinstance(v, list):
         return ", ".join(str(i) for i in v)
     if isinstance(v, dict):
@@ -58,12 +123,18 @@ def _fmt_value(v) -> str:
 def _flatten_dict(d: dict, parent_key: str = "", sep: str = " > ") -> list[tuple[str, str]]:
     """Flatten nested dicts into (label, value) pairs."""
     items: list[tuple[str, str]] = []
-    for k, v in d.items():
-        label = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(_flatten_dict(v, label, sep))
-        else:
+    # Iterators rather than dicts on the stack keep the depth-first key order
+    stack = [(iter(d.items()), parent_key)]
+    while stack:
+        it, parent = stack[-1]
+        for k, v in it:
+            label = f"{parent}{sep}{k}" if parent else k
+            if isinstance(v, dict):
+                stack.append((iter(v.items()), label))
+                break
             items.append((label, _fmt_value(v)))
+        else:
+            stack.pop()
     return items
 
 
@@ -80,18 +151,17 @@ def _seed_engine(data: dict, vehicle_name: str) -> Iterator[dict]:
 
     # Core specs chunk
     code = engine.get("code", "")
-    lines = [
-        f"{vehicle_name} Engine Specifications ({code})",
-        f"Type: {engine.get('type', '')}",
-        f"Displacement: {engine.get('displacement_l', '')}L ({engine.get('displacement_cc', '')}cc)",
-        f"Fuel system: {engine.get('fuel_system', '')}",
-        f"Horsepower: {engine.get('horsepower', '')} hp",
-        f"Torque: {engine.get('torque_lb_ft', '')} lb-ft",
-        f"Compression ratio: {engine.get('compression_ratio', '')}",
-        f"Firing order: {engine.get('firing_order', '')}",
-        f"Bore: {engine.get('bore_mm', '')} mm, Stroke: {engine.get('stroke_mm', '')} mm",
-    ]
-    text = "\n".join(lines)
+    text = (
+        f"{vehicle_name} Engine Specifications ({code})\n"
+        f"Type: {engine.get('type', '')}\n"
+        f"Displacement: {engine.get('displacement_l', '')}L ({engine.get('displacement_cc', '')}cc)\n"
+        f"Fuel system: {engine.get('fuel_system', '')}\n"
+        f"Horsepower: {engine.get('horsepower', '')} hp\n"
+        f"Torque: {engine.get('torque_lb_ft', '')} lb-ft\n"
+        f"Compression ratio: {engine.get('compression_ratio', '')}\n"
+        f"Firing order: {engine.get('firing_order', '')}\n"
+        f"Bore: {engine.get('bore_mm', '')} mm, Stroke: {engine.get('stroke_mm', '')} mm"
+    )
     yield {
         "source": "yaml",
         "source_id": "engine_specs",
@@ -106,7 +176,7 @@ def _seed_engine(data: dict, vehicle_name: str) -> Iterator[dict]:
         flat = _flatten_dict(fluid_data)
         lines = [f"{vehicle_name} Engine {fluid_name.title()} Specifications"]
         for label, value in flat:
-            nice_label = label.replace("_", " ").title()
+            nice_label = _pretty(label)
             lines.append(f"{nice_label}: {value}")
         text = "\n".join(lines)
         yield {
@@ -120,15 +190,15 @@ def _seed_engine(data: dict, vehicle_name: str) -> Iterator[dict]:
     # Maintenance schedules
     maint = engine.get("maintenance", {})
     for item_name, item_data in maint.items():
-        lines = [f"{vehicle_name} Maintenance: {item_name.replace('_', ' ').title()}"]
+        lines = [f"{vehicle_name} Maintenance: {_pretty(item_name)}"]
         for k, v in item_data.items():
-            nice = k.replace("_", " ").title()
+            nice = _pretty(k)
             lines.append(f"{nice}: {_fmt_value(v)}")
         text = "\n".join(lines)
         yield {
             "source": "yaml",
             "source_id": f"engine_maint_{item_name}",
-            "title": f"Maintenance Schedule: {item_name.replace('_', ' ').title()}",
+            "title": f"Maintenance Schedule: {_pretty(item_name)}",
             "content": text,
             "category": "engine",
         }
@@ -151,7 +221,7 @@ def _seed_transmission(data: dict, vehicle_name: str) -> Iterator[dict]:
                 for gear, ratio in v.items():
                     lines.append(f"  {gear.title()}: {ratio}")
             else:
-                lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+                lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         text = "\n".join(lines)
         yield {
             "source": "yaml",
@@ -174,7 +244,7 @@ def _seed_transfer_case(data: dict, vehicle_name: str) -> Iterator[dict]:
             for gear, ratio in v.items():
                 lines.append(f"  {gear.title()}: {ratio}")
         else:
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
     text = "\n".join(lines)
     yield {
         "source": "yaml",
@@ -193,7 +263,7 @@ def _seed_axles(data: dict, vehicle_name: str) -> Iterator[dict]:
             continue
         lines = [f"{vehicle_name} {position.title()} Axle"]
         for k, v in axle.items():
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         text = "\n".join(lines)
         yield {
             "source": "yaml",
@@ -215,7 +285,7 @@ def _seed_brakes(data: dict, vehicle_name: str) -> Iterator[dict]:
             continue
         lines = [f"{vehicle_name} {section.title()} Brakes"]
         for k, v in bd.items():
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         text = "\n".join(lines)
         yield {
             "source": "yaml",
@@ -233,10 +303,10 @@ def _seed_brakes(data: dict, vehicle_name: str) -> Iterator[dict]:
         extra_lines.append(f"ABS Module: {brakes['abs_module']}")
     fluid = brakes.get("fluid", {})
     for k, v in fluid.items():
-        extra_lines.append(f"Brake Fluid {k.replace('_', ' ').title()}: {v}")
+        extra_lines.append(f"Brake Fluid {_pretty(k)}: {v}")
     pb = brakes.get("parking_brake", {})
     for k, v in pb.items():
-        extra_lines.append(f"Parking Brake {k.replace('_', ' ').title()}: {v}")
+        extra_lines.append(f"Parking Brake {_pretty(k)}: {v}")
     if len(extra_lines) > 1:
         yield {
             "source": "yaml",
@@ -257,7 +327,7 @@ def _seed_suspension(data: dict, vehicle_name: str) -> Iterator[dict]:
             continue
         lines = [f"{vehicle_name} {section.title()} Suspension"]
         for k, v in sd.items():
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         text = "\n".join(lines)
         yield {
             "source": "yaml",
@@ -271,7 +341,7 @@ def _seed_suspension(data: dict, vehicle_name: str) -> Iterator[dict]:
     if sway:
         lines = [f"{vehicle_name} Sway Bars"]
         for k, v in sway.items():
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         yield {
             "source": "yaml",
             "source_id": "sway_bars",
@@ -287,7 +357,7 @@ def _seed_steering(data: dict, vehicle_name: str) -> Iterator[dict]:
         return
     lines = [f"{vehicle_name} Steering"]
     for k, v in steer.items():
-        lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+        lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
     yield {
         "source": "yaml",
         "source_id": "steering",
@@ -304,13 +374,13 @@ def _seed_electrical(data: dict, vehicle_name: str) -> Iterator[dict]:
     for section_name, section_data in elec.items():
         if not isinstance(section_data, dict):
             continue
-        lines = [f"{vehicle_name} Electrical: {section_name.replace('_', ' ').title()}"]
+        lines = [f"{vehicle_name} Electrical: {_pretty(section_name)}"]
         for k, v in section_data.items():
-            lines.append(f"{k.replace('_', ' ').title()}: {_fmt_value(v)}")
+            lines.append(f"{_pretty(k)}: {_fmt_value(v)}")
         yield {
             "source": "yaml",
             "source_id": f"electrical_{section_name}",
-            "title": f"Electrical: {section_name.replace('_', ' ').title()}",
+            "title": f"Electrical: {_pretty(section_name)}",
             "content": "\n".join(lines),
             "category": "electrical",
         }
@@ -326,15 +396,15 @@ def _seed_dimensions_weights(data: dict, vehicle_name: str) -> Iterator[dict]:
         if dims:
             lines.append("\nDimensions:")
             for k, v in dims.items():
-                lines.append(f"  {k.replace('_', ' ').title()}: {v}")
+                lines.append(f"  {_pretty(k)}: {v}")
         if weights:
             lines.append("\nWeights:")
             for k, v in weights.items():
-                lines.append(f"  {k.replace('_', ' ').title()}: {v}")
+                lines.append(f"  {_pretty(k)}: {v}")
         if caps:
             lines.append("\nCapacities:")
             for k, v in caps.items():
-                lines.append(f"  {k.replace('_', ' ').title()}: {v}")
+                lines.append(f"  {_pretty(k)}: {v}")
         yield {
             "source": "yaml",
             "source_id": "dims_weights_caps",
@@ -348,58 +418,81 @@ def _seed_tires(data: dict, vehicle_name: str) -> Iterator[dict]:
     tires = data.get("tires", {})
     if not tires:
         return
-    lines = [f"{vehicle_name} Tire Specifications"]
-    lines.append(f"OEM Size: {tires.get('oem_size', 'N/A')}")
-    lines.append(f"Rotation Interval: {tires.get('rotation_interval_miles', 'N/A')} miles")
-    lines.append(f"Front Pressure: {tires.get('pressure_front_psi', 'N/A')} psi")
-    lines.append(f"Rear Pressure: {tires.get('pressure_rear_psi', 'N/A')} psi")
-    lines.append(f"Spare Location: {tires.get('spare_location', 'N/A')}")
+    text = (
+        f"{vehicle_name} Tire Specifications\n"
+        f"OEM Size: {tires.get('oem_size', 'N/A')}\n"
+        f"Rotation Interval: {tires.get('rotation_interval_miles', 'N/A')} miles\n"
+        f"Front Pressure: {tires.get('pressure_front_psi', 'N/A')} psi\n"
+        f"Rear Pressure: {tires.get('pressure_rear_psi', 'N/A')} psi\n"
+        f"Spare Location: {tires.get('spare_location', 'N/A')}"
+    )
 
     alts = tires.get("alternatives", [])
     if alts:
-        lines.append("\nAlternative Tire Sizes:")
-        for alt in alts:
-            lines.append(f"  {alt.get('size', '?')}: {alt.get('notes', '')}")
+        text += "\n\nAlternative Tire Sizes:\n" + "\n".join(
+            f"  {alt.get('size', '?')}: {alt.get('notes', '')}" for alt in alts
+        )
 
     yield {
         "source": "yaml",
         "source_id": "tires",
         "title": "Tire Specifications & Alternatives",
-        "content": "\n".join(lines),
+        "content": text,
         "category": "chassis",
     }
 
 
+def _fmt_bullets(items) -> str:
+    return "".join(f"\n  - {item}" for item in items)
+
+
+def _fmt_cost_range(r) -> str:
+    return f"${r[0]:,} - ${r[1]:,}"
+
+
+def _fmt_part_numbers(part_numbers: dict) -> str:
+    return "".join(f"\n  {_pretty(label)}: {value}" for label, value in part_numbers.items())
+
+
+# Optional per-record fields, in output order: (key, line template, value formatter)
+_ISSUE_FIELDS: tuple[tuple[str, str, Callable[[object], str]], ...] = (
+    ("affected_years", "Affected Years: {}", _fmt_value),
+    ("typical_cost_range", "Typical Cost: {}", _fmt_cost_range),
+    ("symptoms", "Symptoms:{}", _fmt_bullets),
+    ("causes", "Causes:{}", _fmt_bullets),
+    ("prevention", "Prevention:{}", _fmt_bullets),
+    ("fix", "Fix: {}", str),
+)
+
+_MOD_FIELDS: tuple[tuple[str, str, Callable[[object], str]], ...] = (
+    ("description", "Description: {}", str),
+    ("lift_height", "Lift Height: {}", str),
+    ("vendor", "Vendor: {}", str),
+    ("notes", "Notes: {}", str),
+    ("part_numbers", "Part Numbers:{}", _fmt_part_numbers),
+    ("locations", "Locations: {}", _fmt_value),
+    ("install_difficulty", "Install Difficulty: {}", str),
+)
+
+
 def _seed_common_issues(data: dict, vehicle_name: str) -> Iterator[dict]:
     issues = data.get("common_issues", [])
     for issue in issues:
         code = issue.get("code", "UNKNOWN")
-        lines = [f"{vehicle_name} Common Issue: {issue.get('description', code)}"]
-        lines.append(f"Severity: {issue.get('severity', 'unknown')}")
-        if "affected_years" in issue:
-            lines.append(f"Affected Years: {_fmt_value(issue['affected_years'])}")
-        if "typical_cost_range" in issue:
-            r = issue["typical_cost_range"]
-            lines.append(f"Typical Cost: ${r[0]:,} - ${r[1]:,}")
-        if "symptoms" in issue:
-            lines.append("Symptoms:")
-            for s in issue["symptoms"]:
-                lines.append(f"  - {s}")
-        if "causes" in issue:
-            lines.append("Causes:")
-            for c in issue["causes"]:
-                lines.append(f"  - {c}")
-        if "prevention" in issue:
-            lines.append("Prevention:")
-            for p in issue["prevention"]:
-                lines.append(f"  - {p}")
-        if "fix" in issue:
-            lines.append(f"Fix: {issue['fix']}")
+        lines = [
+            f"{vehicle_name} Common Issue: {issue.get('description', code)}",
+            f"Severity: {issue.get('severity', 'unknown')}",
+            *(
+                template.format(fmt(issue[key]))
+                for key, template, fmt in _ISSUE_FIELDS
+                if key in issue
+            ),
+        ]
 
         yield {
             "source": "yaml",
             "source_id": f"issue_{code.lower()}",
-            "title": f"Common Issue: {code.replace('_', ' ').title()}",
+            "title": f"Common Issue: {_pretty(code)}",
             "content": "\n".join(lines),
             "category": "forum_troubleshoot",
         }
@@ -410,26 +503,18 @@ def _seed_modifications(data: dict, vehicle_name: str) -> Iterator[dict]:
     for group_name, mod_list in mods.items():
         if not isinstance(mod_list, list):
             continue
+        category_line = f"Category: {_pretty(group_name)}"
         for mod in mod_list:
             name = mod.get("name", "Unknown Mod")
-            lines = [f"{vehicle_name} Modification: {name}"]
-            lines.append(f"Category: {group_name.replace('_', ' ').title()}")
-            if "description" in mod:
-                lines.append(f"Description: {mod['description']}")
-            if "lift_height" in mod:
-                lines.append(f"Lift Height: {mod['lift_height']}")
-            if "vendor" in mod:
-                lines.append(f"Vendor: {mod['vendor']}")
-            if "notes" in mod:
-                lines.append(f"Notes: {mod['notes']}")
-            if "part_numbers" in mod:
-                lines.append("Part Numbers:")
-                for pn_label, pn_val in mod["part_numbers"].items():
-                    lines.append(f"  {pn_label.replace('_', ' ').title()}: {pn_val}")
-            if "locations" in mod:
-                lines.append(f"Locations: {_fmt_value(mod['locations'])}")
-            if "install_difficulty" in mod:
-                lines.append(f"Install Difficulty: {mod['install_difficulty']}")
+            lines = [
+                f"{vehicle_name} Modification: {name}",
+                category_line,
+                *(
+                    template.format(fmt(mod[key]))
+                    for key, template, fmt in _MOD_FIELDS
+                    if key in mod
+                ),
+            ]
 
             yield {
                 "source": "yaml",
@@ -440,6 +525,23 @@ def _seed_modifications(data: dict, vehicle_name: str) -> Iterator[dict]:
             }
 
 
+# YAML sections each generator reads → generator, in output order
+_GENERATORS: tuple[tuple[tuple[str, ...], Callable[[dict, str], Iterator[dict]]], ...] = (
+    (("engine",), _seed_engine),
+    (("transmission",), _seed_transmission),
+    (("transfer_case",), _seed_transfer_case),
+    (("axles",), _seed_axles),
+    (("brakes",), _seed_brakes),
+    (("suspension",), _seed_suspension),
+    (("steering",), _seed_steering),
+    (("electrical",), _seed_electrical),
+    (("dimensions", "weights", "capacities"), _seed_dimensions_weights),
+    (("tires",), _seed_tires),
+    (("common_issues",), _seed_common_issues),
+    (("modifications",), _seed_modifications),
+)
+
+
 # ---------------------------------------------------------------------------
 # Main seeder
 # ---------------------------------------------------------------------------
@@ -456,36 +558,26 @@ def seed_from_yaml(
 
     If *output_jsonl* is given, documents are also written to that file.
     """
-    with open(yaml_path) as f:
-        data = yaml.safe_load(f)
+    data = _load_yaml_cached(yaml_path)
 
     vehicle_name = data.get("name", data.get("vehicle_type", "Unknown"))
 
-    generators = [
-        _seed_engine,
-        _seed_transmission,
-        _seed_transfer_case,
-        _seed_axles,
-        _seed_brakes,
-        _seed_suspension,
-        _seed_steering,
-        _seed_electrical,
-        _seed_dimensions_weights,
-        _seed_tires,
-        _seed_common_issues,
-        _seed_modifications,
-    ]
-
     documents: list[dict] = []
-    for gen in generators:
-        for doc in gen(data, vehicle_name):
-            documents.append(doc)
+    for sections, gen in _GENERATORS:
+        # Skip generators whose sections are absent or empty in this config
+        if any(data.get(key) for key in sections):
+            documents.extend(gen(data, vehicle_name))
 
     if output_jsonl:
         output_jsonl.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_jsonl, "w") as f:
-            for doc in documents:
-                f.write(json.dumps(doc) + "\n")
+        # A vehicle config yields a few dozen small docs: one buffer, one write
+        if orjson is not None:
+            payload = b"".join(
+                orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in documents
+            )
+        else:
+            payload = "".join(json.dumps(doc) + "\n" for doc in documents).encode()
+        output_jsonl.write_bytes(payload)
         logger.info("Wrote %d documents to %s", len(documents), output_jsonl)
 
     return documents
@@ -495,40 +587,52 @@ def seed_to_chromadb(
     yaml_path: Path,
     chromadb_dir: Path,
     vehicle_type: str | None = None,
+    documents: list[dict] | None = None,
 ) -> int:
     """Seed ChromaDB directly from a vehicle YAML config.
 
+    Pass *documents* when they were already produced by ``seed_from_yaml()``
+    to skip regenerating them.
+
     Returns the number of chunks added.
     """
-    from tools.kb_builder.builder import KnowledgeBaseBuilder, Chunk
-
-    with open(yaml_path) as f:
-        data = yaml.safe_load(f)
+    from tools.kb_builder.builder import KnowledgeBaseBuilder
 
-    vtype = vehicle_type or data.get("vehicle_type", "fzj80")
+    vtype = vehicle_type or _load_yaml_cached(yaml_path).get("vehicle_type", "fzj80")
+    if documents is None:
+        documents = seed_from_yaml(yaml_path)
 
     builder = KnowledgeBaseBuilder(chromadb_dir)
-    collections = builder.create_collections(vtype)
+    return _add_documents(builder, vtype, documents)
 
-    documents = seed_from_yaml(yaml_path)
-    total = 0
 
+def _add_documents(builder, vtype: str, documents: list[dict]) -> int:
+    """Add seeded *documents* to *vtype*'s collections via *builder*."""
+    from tools.kb_builder.builder import Chunk
+
+    collections = builder.create_collections(vtype)
+
+    # Group per collection so each one gets a single embed + add pass
+    by_category: dict[str, list[Chunk]] = defaultdict(list)
     for doc in documents:
         cat = doc["category"]
         if cat not in collections:
             logger.warning("Skipping unknown category: %s", cat)
             continue
 
-        chunk = Chunk(
+        by_category[cat].append(Chunk(
             id=_chunk_id(doc["content"], doc["source_id"]),
             text=doc["content"],
             source=doc["source"],
             source_id=doc["source_id"],
             category=cat,
             metadata={"title": doc.get("title", "")},
-        )
-        builder.add_chunks(collections[cat], [chunk])
-        total += 1
+        ))
+
+    total = 0
+    for cat, chunks in by_category.items():
+        builder.add_chunks(collections[cat], chunks)
+        total += len(chunks)
 
     logger.info("Seeded %d chunks into ChromaDB for %s", total, vtype)
     return total
@@ -539,11 +643,28 @@ def seed_to_chromadb(
 # ---------------------------------------------------------------------------
 
 
+def _resolve_vehicles(spec: str, config_dir: Path) -> list[str]:
+    """Expand a comma-separated list of vehicle codes and globs (``fj*``)."""
+    vehicles: list[str] = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        if any(c in part for c in "*?["):
+            vehicles.extend(sorted(
+                p.stem for p in config_dir.glob(f"{part}.yaml")
+                if not p.stem.endswith("_keywords")
+            ))
+        else:
+            vehicles.append(part)
+    return list(dict.fromkeys(vehicles))
+
+
 def main():
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     parser = argparse.ArgumentParser(description="Seed ChromaDB from vehicle YAML config")
-    parser.add_argument("--vehicle", default="fzj80", help="Vehicle type code")
+    parser.add_argument(
+        "--vehicle", default="fzj80",
+        help="Vehicle type code, or a comma-separated list / glob of codes",
+    )
     parser.add_argument("--config-dir", default=None, help="Vehicle config directory")
     parser.add_argument("--chromadb-dir", default=None, help="ChromaDB persist directory")
     parser.add_argument("--dry-run", action="store_true", help="Write JSONL only, don't touch ChromaDB")
@@ -553,22 +674,52 @@ def main():
     project_root = Path(__file__).resolve().parent.parent.parent
     config_dir = Path(args.config_dir) if args.config_dir else project_root / "config" / "vehicles"
     chromadb_dir = Path(args.chromadb_dir) if args.chromadb_dir else project_root / "data" / "chromadb"
-    yaml_path = config_dir / f"{args.vehicle}.yaml"
 
-    if not yaml_path.exists():
-        logger.error("YAML config not found: %s", yaml_path)
+    vehicles = _resolve_vehicles(args.vehicle, config_dir)
+    if not vehicles:
+        logger.error("No vehicle configs match %r in %s", args.vehicle, config_dir)
+        return
+    if args.output and len(vehicles) > 1:
+        parser.error("--output can only be used with a single vehicle")
+
+    # vehicle → (yaml_path, output_jsonl)
+    jobs: dict[str, tuple[Path, Path]] = {}
+    for vehicle in vehicles:
+        yaml_path = config_dir / f"{vehicle}.yaml"
+        if not yaml_path.exists():
+            logger.error("YAML config not found: %s", yaml_path)
+            continue
+        output = Path(args.output) if args.output else project_root / "data" / f"{vehicle}_yaml.jsonl"
+        jobs[vehicle] = (yaml_path, output)
+    if not jobs:
         return
 
-    output = Path(args.output) if args.output else project_root / "data" / f"{args.vehicle}_yaml.jsonl"
+    if len(jobs) == 1:
+        results = {v: seed_from_yaml(yaml_path, output) for v, (yaml_path, output) in jobs.items()}
+    else:
+        # Parse + chunk each config in its own process; ChromaDB writes stay here
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                v: pool.submit(seed_from_yaml, yaml_path, output)
+                for v, (yaml_path, output) in jobs.items()
+            }
+            results = {v: f.result() for v, f in futures.items()}
 
-    documents = seed_from_yaml(yaml_path, output_jsonl=output)
-    print(f"Generated {len(documents)} documents from {yaml_path.name}")
+    for vehicle, documents in results.items():
+        print(f"Generated {len(documents)} documents from {jobs[vehicle][0].name}")
 
     if not args.dry_run:
-        count = seed_to_chromadb(yaml_path, chromadb_dir, args.vehicle)
-        print(f"Seeded {count} chunks into ChromaDB")
+        from tools.kb_builder.builder import KnowledgeBaseBuilder
+
+        # One builder so the embedding model loads once for every vehicle
+        builder = KnowledgeBaseBuilder(chromadb_dir)
+        for vehicle, documents in results.items():
+            count = _add_documents(builder, vehicle, documents)
+            print(f"Seeded {count} chunks into ChromaDB")
     else:
-        print(f"Dry run — JSONL written to {output}")
+        for _, output in jobs.values():
+            print(f"Dry run — JSONL written to {output}")
 
 
 if __name__ == "__main__":
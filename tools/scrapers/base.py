@@ -1,17 +1,34 @@
 """Base scraper class for RigSherpa data collection."""
+import asyncio
+import json
+import logging
+import threading
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, AsyncIterator
-import asyncio
-import logging
-import json
+from typing import AsyncIterator, BinaryIO, Optional
+from urllib.parse import urlparse
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON output
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:  # httpx needs h2 for HTTP/2; fall back to HTTP/1.1
+    _HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
+# Default cap on one scraper's in-flight HTTP requests
+DEFAULT_REQUEST_CONCURRENCY = 4
+
 
 @dataclass
 class ScrapedDocument:
@@ -64,7 +81,8 @@ class BaseScraper(ABC):
         output_dir: Path,
         rate_limit: float = 2.0,
         max_retries: int = 3,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        request_slot: Optional[asyncio.Semaphore] = None
     ):
         """Initialize scraper.
         
@@ -73,18 +91,32 @@ class BaseScraper(ABC):
             rate_limit: Minimum seconds between requests
             max_retries: Maximum retry attempts
             timeout: Request timeout in seconds
+            request_slot: Semaphore held while a request is in flight
+                (default: a private one allowing DEFAULT_REQUEST_CONCURRENCY)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.rate_limit = rate_limit
         self.max_retries = max_retries
         self.timeout = timeout
-        self._last_request = 0.0
+        self.request_slot = request_slot or asyncio.Semaphore(DEFAULT_REQUEST_CONCURRENCY)
+        # Earliest time the next request to each host may start
+        self._next_request: defaultdict[str, float] = defaultdict(float)
         self.client: Optional[httpx.AsyncClient] = None
+        # save_batch() output handles, opened on first use and kept for the run
+        self._batch_files: dict[str, BinaryIO] = {}
+        self._batch_lock = threading.Lock()
         
     async def __aenter__(self):
         """Async context manager entry."""
+        # fetch() does its own retries, so the transport shouldn't add more
+        transport = httpx.AsyncHTTPTransport(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            retries=0,
+        )
         self.client = httpx.AsyncClient(
+            transport=transport,
             timeout=self.timeout,
             follow_redirects=True,
             headers={
@@ -97,14 +129,35 @@ class BaseScraper(ABC):
         """Async context manager exit."""
         if self.client:
             await self.client.aclose()
+        self.close()
     
-    async def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        now = asyncio.get_event_loop().time()
-        elapsed = now - self._last_request
-        if elapsed < self.rate_limit:
-            await asyncio.sleep(self.rate_limit - elapsed)
-        self._last_request = asyncio.get_event_loop().time()
+    def close(self):
+        """Close any batch files left open by save_batch()."""
+        with self._batch_lock:
+            for f in self._batch_files.values():
+                f.close()
+            self._batch_files.clear()
+
+    async def _rate_limit(self, url: Optional[str] = None):
+        """Enforce rate limiting between requests to the same host.
+
+        The slot is reserved before sleeping, so concurrent callers for one
+        host queue up ``rate_limit`` seconds apart instead of waking together.
+        Call it while holding ``request_slot``: the reserved start time then
+        is when the request actually goes out.
+        """
+        host = urlparse(url).netloc if url else ""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_request[host])
+        self._next_request[host] = start + self.rate_limit
+        if start > now:
+            try:
+                await asyncio.sleep(start - now)
+            except asyncio.CancelledError:
+                # Hand back the slot if nobody has queued behind it
+                if self._next_request[host] == start + self.rate_limit:
+                    self._next_request[host] = start
+                raise
     
     async def fetch(self, url: str) -> Optional[str]:
         """Fetch a URL with rate limiting and retries.
@@ -117,8 +170,11 @@ class BaseScraper(ABC):
         """
         for attempt in range(self.max_retries):
             try:
-                await self._rate_limit()
-                response = await self.client.get(url)
+                # Reserve the host slot only once a request slot is held, so
+                # requests queued on a saturated semaphore can't fire together
+                async with self.request_slot:
+                    await self._rate_limit(url)
+                    response = await self.client.get(url)
                 response.raise_for_status()
                 return response.text
             except httpx.HTTPError as e:
@@ -127,28 +183,70 @@ class BaseScraper(ABC):
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
         return None
     
+    async def fetch_many(self, urls: list[str], concurrency: int = 4) -> list[Optional[str]]:
+        """Fetch several URLs concurrently over the shared client.
+
+        Hosts are rate-limited independently, so a slow response from one
+        site doesn't hold up requests to another.
+
+        Args:
+            urls: URLs to fetch
+            concurrency: Maximum requests in flight from this call
+
+        Returns:
+            Response texts (None for failures), in the same order as *urls*
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _bounded(url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.fetch(url)
+
+        return list(await asyncio.gather(*(_bounded(u) for u in urls)))
+
     @abstractmethod
     async def scrape(self) -> AsyncIterator[ScrapedDocument]:
         """Main scraping logic. Yields scraped documents."""
         pass
     
-    def save_document(self, doc: ScrapedDocument):
+    async def save_document(self, doc: ScrapedDocument):
+        """Save a scraped document to disk without blocking the event loop."""
+        await asyncio.to_thread(self._save_document_sync, doc)
+
+    async def save_batch(self, docs: list[ScrapedDocument], batch_name: str):
+        """Save a batch of documents without blocking the event loop."""
+        await asyncio.to_thread(self._save_batch_sync, docs, batch_name)
+
+    def _save_document_sync(self, doc: ScrapedDocument):
         """Save a scraped document to disk."""
         filename = f"{doc.source}_{doc.source_id}.json"
         filepath = self.output_dir / filename
         
-        with open(filepath, "w") as f:
-            json.dump(doc.to_dict(), f, indent=2)
+        if orjson is not None:
+            filepath.write_bytes(orjson.dumps(doc.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(doc.to_dict(), f, indent=2)
             
         logger.debug(f"Saved: {filepath}")
     
-    def save_batch(self, docs: list[ScrapedDocument], batch_name: str):
+    def _save_batch_sync(self, docs: list[ScrapedDocument], batch_name: str):
         """Save a batch of documents."""
         filepath = self.output_dir / f"{batch_name}.jsonl"
 
-        with open(filepath, "a") as f:
-            for doc in docs:
-                f.write(json.dumps(doc.to_dict()) + "\n")
+        # Worker threads may run concurrent saves; keep batches whole on disk
+        with self._batch_lock:
+            f = self._batch_files.get(batch_name)
+            if f is None:
+                f = self._batch_files[batch_name] = open(filepath, "ab", buffering=1 << 20)
+            if orjson is not None:
+                f.writelines(
+                    orjson.dumps(doc.to_dict(), option=orjson.OPT_APPEND_NEWLINE) for doc in docs
+                )
+            else:
+                f.writelines((json.dumps(doc.to_dict()) + "\n").encode() for doc in docs)
+            # One flush per batch keeps the file readable mid-run
+            f.flush()
 
         logger.info(f"Saved batch of {len(docs)} documents to {filepath}")
 
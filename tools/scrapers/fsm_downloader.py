@@ -30,6 +30,10 @@ def download_fsm(
 ) -> Path:
     """Download the FSM PDF from Google Drive.
 
+    gdown handles Drive's virus-scan confirmation page for large files and,
+    with ``resume=True``, continues an interrupted download from its
+    partial file instead of starting over.
+
     Returns the path to the downloaded PDF.
     """
     try:
@@ -47,11 +51,13 @@ def download_fsm(
         return pdf_path
 
     logger.info("Downloading FSM PDF from Google Drive ...")
-    gdown.download(GDRIVE_URL, str(pdf_path), quiet=False)
+    gdown.download(GDRIVE_URL, str(pdf_path), quiet=False, resume=True)
 
     if pdf_path.exists():
         size_mb = pdf_path.stat().st_size / (1024 * 1024)
         logger.info("Downloaded: %s (%.1f MB)", pdf_path, size_mb)
+        # Left behind by the earlier httpx-based downloader, if it ever ran
+        pdf_path.with_suffix(pdf_path.suffix + ".part").unlink(missing_ok=True)
     else:
         logger.error("Download failed — file not found at %s", pdf_path)
 
@@ -19,18 +19,118 @@ import asyncio
 import json
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, BinaryIO, Optional
 
-from bs4 import BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: much faster than BeautifulSoup for listing/thread pages
+    LexborHTMLParser = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional single-pass keyword matching
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional speedup for JSON output
+    orjson = None
 
 from tools.scrapers.base import BaseScraper, ScrapedDocument
 from tools.scrapers.state import ScrapeStateManager
 
 logger = logging.getLogger(__name__)
 
+_THREAD_ID_HREF_RE = re.compile(r"\.(\d+)/?$")
+_THREAD_ID_URL_RE = re.compile(r"/threads/[^/]+\.(\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Category keywords, in priority order: the first category with any hit wins
+_CONTENT_CATEGORIES: dict[str, tuple[str, ...]] = {
+    "engine": ("1fz", "engine", "head gasket", "timing", "oil", "coolant", "overheating"),
+    "drivetrain": ("birfield", "cv joint", "knuckle", "hub", "diff", "locker", "axle",
+                   "transmission", "a442f", "shift", "torque converter", "transfer case"),
+    "electrical": ("wiring", "ecu", "sensor", "relay", "fuse", "electrical", "alternator"),
+    "chassis": ("brake", "rotor", "pad", "caliper", "abs",
+                "lift", "spring", "shock", "sway bar", "suspension",
+                "steering", "power steering", "rack"),
+    "body": ("rust", "paint", "body", "door", "window"),
+    "forum_mods": ("lift kit", "bumper", "winch", "rack", "lights", "mod", "build",
+                   "install", "upgrade", "swap"),
+    "forum_maintenance": ("oil change", "maintenance", "service", "filter", "flush"),
+}
+_CATEGORY_NAMES: list[str] = list(_CONTENT_CATEGORIES)
+
+_TAG_PATTERNS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("1fz-fe", ("1fz", "1fz-fe")),
+    ("fzj80", ("fzj80", "80 series")),
+    ("diy", ("how to", "step by step", "procedure")),
+    ("troubleshooting", ("problem", "issue", "help", "won't")),
+    ("parts", ("part number", "oem", "replace")),
+)
+
+
+def _build_keyword_automaton(groups: list[tuple[str, ...]]):
+    """Automaton mapping each keyword to the (ascending) indices of its groups."""
+    if ahocorasick is None:
+        return None
+    owners: dict[str, list[int]] = {}
+    for i, keywords in enumerate(groups):
+        for kw in keywords:
+            owners.setdefault(kw, []).append(i)
+    automaton = ahocorasick.Automaton()
+    for kw, indices in owners.items():
+        automaton.add_word(kw, tuple(indices))
+    automaton.make_automaton()
+    return automaton
+
+
+_CATEGORY_AUTOMATON = _build_keyword_automaton(list(_CONTENT_CATEGORIES.values()))
+_TAG_AUTOMATON = _build_keyword_automaton([patterns for _, patterns in _TAG_PATTERNS])
+
+
+# ---------------------------------------------------------------------------
+# HTML helpers — selectolax when installed, BeautifulSoup otherwise
+# ---------------------------------------------------------------------------
+
+if LexborHTMLParser is not None:
+    def _parse_html(html: str):
+        return LexborHTMLParser(html)
+
+    def _select(node, selector: str) -> list:
+        return node.css(selector)
+
+    def _select_one(node, selector: str):
+        return node.css_first(selector)
+
+    def _text(node) -> str:
+        return node.text(strip=True)
+
+    def _attr(node, name: str) -> str:
+        return node.attributes.get(name) or ""
+else:
+    from bs4 import BeautifulSoup
+
+    def _parse_html(html: str):
+        return BeautifulSoup(html, "lxml")
+
+    def _select(node, selector: str) -> list:
+        return node.select(selector)
+
+    def _select_one(node, selector: str):
+        return node.select_one(selector)
+
+    def _text(node) -> str:
+        return node.get_text(strip=True)
+
+    def _attr(node, name: str) -> str:
+        return node.get(name, "")
+
 
 @dataclass
 class ForumPost:
@@ -84,6 +184,8 @@ class IH8MUDScraper(BaseScraper):
 
     MIN_POST_LENGTH = 100
     MAX_THREAD_PAGES = 10
+    CONTENT_CONCURRENCY = 16  # threads scraped at once in the content pass
+    INDEX_PREFETCH = 8  # listing pages fetched ahead of the one being parsed
 
     def __init__(
         self,
@@ -111,6 +213,17 @@ class IH8MUDScraper(BaseScraper):
             self._state = ScrapeStateManager(self.output_dir / ".." / "scrape_state.db")
         return self._state
 
+    @staticmethod
+    async def _parse_off_loop(fn, *args):
+        """Run an HTML parse *fn* in a worker thread, off the event loop.
+
+        Fetches are spaced rate_limit seconds apart, so a thread keeps up
+        with the parse load; a process pool would cost more shipping each
+        page over IPC than the parse itself, and forking from the running
+        loop's threaded process risks deadlocked workers.
+        """
+        return await asyncio.to_thread(fn, *args)
+
     # ------------------------------------------------------------------
     # Main entry point
     # ------------------------------------------------------------------
@@ -145,83 +258,111 @@ class IH8MUDScraper(BaseScraper):
         index_path = self.output_dir / "thread_index.jsonl"
         index_path.parent.mkdir(parents=True, exist_ok=True)
 
-        for forum_name, forum_path in forums.items():
-            state_key = f"ih8mud_index_{forum_name}"
-            start_page = self.state.get_resume_page(state_key) if self.resume else 1
-            if start_page < 1:
-                start_page = 1
-
-            logger.info("Indexing %s from page %d ...", forum_name, start_page)
-            self.state.set_status(state_key, "running")
-
-            page = start_page
-            while page <= self.max_pages:
-                url = f"{self.BASE_URL}/{forum_path}page-{page}"
-                html = await self.fetch(url)
-                if not html:
-                    break
-
-                entries = self._extract_thread_index(html, forum_name)
-                if not entries:
-                    logger.info("No more threads in %s at page %d", forum_name, page)
-                    break
-
-                # Append to index file
-                with open(index_path, "a") as f:
-                    for entry in entries:
-                        f.write(json.dumps({
-                            "thread_id": entry.thread_id,
-                            "title": entry.title,
-                            "url": entry.url,
-                            "replies": entry.replies,
-                            "views": entry.views,
-                            "last_activity": entry.last_activity,
-                            "forum": forum_name,
-                        }) + "\n")
-
-                self.state.mark_page_done(state_key, page)
-
-                if page % 50 == 0:
-                    logger.info("  %s: indexed page %d", forum_name, page)
-
-                page += 1
+        # One buffered handle for the whole pass instead of an open() per page
+        with open(index_path, "ab", buffering=1 << 20) as index_file:
+            for forum_name, forum_path in forums.items():
+                await self._index_forum(forum_name, forum_path, index_file)
+
+    async def _index_forum(self, forum_name: str, forum_path: str, index_file: BinaryIO) -> None:
+        """Crawl one forum's listing pages into the thread index."""
+        state_key = f"ih8mud_index_{forum_name}"
+        start_page = self.state.get_resume_page(state_key) if self.resume else 1
+        if start_page < 1:
+            start_page = 1
+
+        logger.info("Indexing %s from page %d ...", forum_name, start_page)
+        self.state.set_status(state_key, "running")
+
+        # Fetch up to INDEX_PREFETCH pages ahead while the current one is
+        # parsed and written; leftovers are cancelled once the forum ends
+        prefetch: deque[asyncio.Task] = deque()
+        next_page = start_page
+        page = start_page
+        while page <= self.max_pages:
+            while next_page <= self.max_pages and len(prefetch) < self.INDEX_PREFETCH:
+                url = f"{self.BASE_URL}/{forum_path}page-{next_page}"
+                prefetch.append(asyncio.create_task(self.fetch(url)))
+                next_page += 1
+            html = await prefetch.popleft()
+            if not html:
+                break
 
-            self.state.set_status(state_key, "done")
-            logger.info("Finished indexing %s (pages %d-%d)", forum_name, start_page, page - 1)
+            entries = await self._parse_off_loop(
+                self._extract_thread_index, html, forum_name,
+            )
+            if not entries:
+                logger.info("No more threads in %s at page %d", forum_name, page)
+                break
 
-    def _extract_thread_index(self, html: str, forum_name: str) -> list[ThreadIndexEntry]:
+            rows = [
+                {
+                    "thread_id": entry.thread_id,
+                    "title": entry.title,
+                    "url": entry.url,
+                    "replies": entry.replies,
+                    "views": entry.views,
+                    "last_activity": entry.last_activity,
+                    "forum": forum_name,
+                }
+                for entry in entries
+            ]
+            # The state DB is the working index; the JSONL is kept as an export
+            self.state.add_threads(rows)
+            if orjson is not None:
+                index_file.writelines(
+                    orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows
+                )
+            else:
+                index_file.writelines((json.dumps(row) + "\n").encode() for row in rows)
+
+            self.state.mark_page_done(state_key, page)
+
+            if page % 50 == 0:
+                index_file.flush()
+                logger.info("  %s: indexed page %d", forum_name, page)
+
+            page += 1
+
+        # Newest first, so each cancelled fetch can return its rate-limit slot
+        for task in reversed(prefetch):
+            task.cancel()
+        self.state.set_status(state_key, "done")
+        logger.info("Finished indexing %s (pages %d-%d)", forum_name, start_page, page - 1)
+
+    @classmethod
+    def _extract_thread_index(cls, html: str, forum_name: str) -> list[ThreadIndexEntry]:
         """Extract thread metadata from a listing page."""
-        soup = BeautifulSoup(html, "lxml")
+        tree = _parse_html(html)
         entries: list[ThreadIndexEntry] = []
 
-        for item in soup.select(".structItem"):
-            title_link = item.select_one(".structItem-title a")
+        for item in _select(tree, ".structItem"):
+            title_link = _select_one(item, ".structItem-title a")
             if not title_link:
                 continue
 
-            href = title_link.get("href", "")
+            href = _attr(title_link, "href")
             if "/threads/" not in href:
                 continue
 
-            title = title_link.get_text(strip=True)
-            full_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
+            title = _text(title_link)
+            full_url = f"{cls.BASE_URL}{href}" if href.startswith("/") else href
 
             # Extract thread ID
-            tid_match = re.search(r"\.(\d+)/?$", href)
+            tid_match = _THREAD_ID_HREF_RE.search(href)
             thread_id = tid_match.group(1) if tid_match else ""
 
             # Replies / views
             replies = 0
             views = 0
-            pairs = item.select(".pairs--justified dd")
+            pairs = _select(item, ".pairs--justified dd")
             if len(pairs) >= 1:
-                replies = self._parse_count(pairs[0].get_text(strip=True))
+                replies = cls._parse_count(_text(pairs[0]))
             if len(pairs) >= 2:
-                views = self._parse_count(pairs[1].get_text(strip=True))
+                views = cls._parse_count(_text(pairs[1]))
 
             # Last activity
-            time_tag = item.select_one("time")
-            last_activity = time_tag.get("datetime", "") if time_tag else ""
+            time_tag = _select_one(item, "time")
+            last_activity = _attr(time_tag, "datetime") if time_tag else ""
 
             entries.append(ThreadIndexEntry(
                 thread_id=thread_id,
@@ -254,88 +395,100 @@ class IH8MUDScraper(BaseScraper):
     async def _pass_content(self) -> AsyncIterator[ScrapedDocument]:
         """Scrape thread content for unscraped threads in the index."""
         index_path = self.output_dir / "thread_index.jsonl"
-        if not index_path.exists():
+        if not self.state.thread_count() and index_path.exists():
+            # Index built before it moved into the state DB
+            self.state.import_thread_index(index_path)
+        total = self.state.thread_count()
+        if not total:
             logger.warning("No thread index found at %s — run index pass first", index_path)
             return
 
-        # Load index
-        threads: list[dict] = []
-        with open(index_path) as f:
-            for line in f:
-                threads.append(json.loads(line))
-
-        logger.info("Thread index has %d entries", len(threads))
+        logger.info("Thread index has %d entries", total)
 
-        # Deduplicate by thread_id
-        seen: set[str] = set()
-        unique: list[dict] = []
-        for t in threads:
-            tid = t["thread_id"]
-            if tid and tid not in seen:
-                seen.add(tid)
-                unique.append(t)
-        threads = unique
-
-        # Sort by engagement (replies * 0.3 + views * 0.01) descending — best content first
-        threads.sort(key=lambda t: t.get("replies", 0) * 0.3 + t.get("views", 0) * 0.01, reverse=True)
+        # Deduped by thread_id, already-scraped threads dropped, and sorted by
+        # engagement — best content first — all inside SQLite
+        pending = iter(self.state.pending_threads("ih8mud_content"))
 
+        # Keep up to CONTENT_CONCURRENCY threads in flight; the per-host rate
+        # limit in fetch() still spaces the actual requests out. Never launch
+        # more than max_threads could still use, so the cap stays exact.
         scraped = 0
-        for entry in threads:
-            if self.max_threads and scraped >= self.max_threads:
-                break
-
-            tid = entry["thread_id"]
-            if self.state.is_item_done("ih8mud_content", tid):
-                continue
+        in_flight: dict[asyncio.Task, dict] = {}
+        try:
+            while True:
+                while len(in_flight) < self.CONTENT_CONCURRENCY and (
+                    not self.max_threads or scraped + len(in_flight) < self.max_threads
+                ):
+                    entry = next(pending, None)
+                    if entry is None:
+                        break
+                    in_flight[asyncio.create_task(self._scrape_thread(entry["url"]))] = entry
+                if not in_flight:
+                    break
 
-            try:
-                thread = await self._scrape_thread(entry["url"])
-                if thread:
-                    thread.forum_section = entry.get("forum", "")
-                    thread.views = entry.get("views", 0)
-                    thread.replies = entry.get("replies", 0)
-
-                    # Save raw thread data
-                    threads_dir = self.output_dir / "threads"
-                    threads_dir.mkdir(parents=True, exist_ok=True)
-                    raw = {
-                        "thread_id": thread.thread_id,
-                        "title": thread.title,
-                        "url": thread.url,
-                        "forum_section": thread.forum_section,
-                        "views": thread.views,
-                        "replies": thread.replies,
-                        "posts": [
-                            {
-                                "post_id": p.post_id,
-                                "author": p.author,
-                                "date": p.date.isoformat() if p.date else None,
-                                "content": p.content,
-                                "likes": p.likes,
-                                "is_solution": p.is_solution,
-                            }
-                            for p in thread.posts
-                        ],
-                    }
-                    with open(threads_dir / f"{tid}.json", "w") as f:
-                        json.dump(raw, f, indent=2)
-
-                    # Convert to ScrapedDocuments
-                    docs = self._thread_to_documents(thread, thread.forum_section)
-                    for doc in docs:
-                        yield doc
-
-                    self.state.mark_item_done("ih8mud_content", tid)
-                    scraped += 1
-
-                    if scraped % 50 == 0:
-                        logger.info("Scraped %d threads", scraped)
-
-            except Exception as e:
-                logger.error("Error scraping thread %s: %s", tid, e)
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    entry = in_flight.pop(task)
+                    tid = entry["thread_id"]
+                    try:
+                        thread = task.result()
+                        if not thread:
+                            continue
+                        for doc in self._save_thread(thread, entry):
+                            yield doc
+
+                        self.state.mark_item_done("ih8mud_content", tid)
+                        scraped += 1
+
+                        if scraped % 50 == 0:
+                            logger.info("Scraped %d threads", scraped)
+
+                    except Exception as e:
+                        logger.error("Error scraping thread %s: %s", tid, e)
+        finally:
+            for task in in_flight:
+                task.cancel()
 
         logger.info("Content pass complete: scraped %d threads", scraped)
 
+    def _save_thread(self, thread: ForumThread, entry: dict) -> list[ScrapedDocument]:
+        """Attach index metadata, save the raw thread and convert it to documents."""
+        thread.forum_section = entry.get("forum", "")
+        thread.views = entry.get("views") or 0
+        thread.replies = entry.get("replies") or 0
+
+        # Save raw thread data
+        threads_dir = self.output_dir / "threads"
+        threads_dir.mkdir(parents=True, exist_ok=True)
+        raw = {
+            "thread_id": thread.thread_id,
+            "title": thread.title,
+            "url": thread.url,
+            "forum_section": thread.forum_section,
+            "views": thread.views,
+            "replies": thread.replies,
+            "posts": [
+                {
+                    "post_id": p.post_id,
+                    "author": p.author,
+                    "date": p.date.isoformat() if p.date else None,
+                    "content": p.content,
+                    "likes": p.likes,
+                    "is_solution": p.is_solution,
+                }
+                for p in thread.posts
+            ],
+        }
+        raw_path = threads_dir / f"{entry['thread_id']}.json"
+        if orjson is not None:
+            raw_path.write_bytes(orjson.dumps(raw, option=orjson.OPT_INDENT_2))
+        else:
+            with open(raw_path, "w") as f:
+                json.dump(raw, f, indent=2)
+
+        # Convert to ScrapedDocuments
+        return self._thread_to_documents(thread, thread.forum_section)
+
     async def _scrape_thread(self, url: str) -> Optional[ForumThread]:
         """Scrape a thread across multiple pages."""
         all_posts: list[ForumPost] = []
@@ -348,23 +501,19 @@ class IH8MUDScraper(BaseScraper):
             if not html:
                 break
 
-            soup = BeautifulSoup(html, "lxml")
+            page_title, posts, has_next = await self._parse_off_loop(
+                self._parse_thread_page, html, page_num == 1,
+            )
 
             # Extract metadata from first page
             if page_num == 1:
-                title_elem = soup.select_one(".p-title-value")
-                title = title_elem.get_text(strip=True) if title_elem else "Unknown"
-                tid_match = re.search(r"/threads/[^/]+\.(\d+)", url)
+                title = page_title
+                tid_match = _THREAD_ID_URL_RE.search(url)
                 thread_id = tid_match.group(1) if tid_match else url
 
-            # Extract posts from this page
-            for post_elem in soup.select("article.message"):
-                post = self._extract_post(post_elem)
-                if post:
-                    all_posts.append(post)
+            all_posts.extend(posts)
 
-            # Check for next page
-            if not soup.select_one(".pageNav-page--later"):
+            if not has_next:
                 break
 
         if not all_posts:
@@ -378,31 +527,65 @@ class IH8MUDScraper(BaseScraper):
             posts=all_posts,
         )
 
-    def _extract_post(self, post_elem) -> Optional[ForumPost]:
+    @classmethod
+    def _parse_thread_page(
+        cls, html: str, first_page: bool,
+    ) -> tuple[Optional[str], list[ForumPost], bool]:
+        """Parse one thread page into (title, posts, has_next_page).
+
+        The title is only looked up on the first page.
+        """
+        # Substring pre-checks: a page can only have posts or a next link if
+        # the markup appears at all, so most misses skip the CSS queries
+        # (and a page with neither skips building the tree)
+        maybe_posts = "<article" in html
+        maybe_next = "pageNav-page--later" in html
+        if not (first_page or maybe_posts or maybe_next):
+            return None, [], False
+
+        tree = _parse_html(html)
+
+        title = None
+        if first_page:
+            title_elem = _select_one(tree, ".p-title-value")
+            title = _text(title_elem) if title_elem else "Unknown"
+
+        posts = []
+        if maybe_posts:
+            for post_elem in _select(tree, "article.message"):
+                post = cls._extract_post(post_elem)
+                if post:
+                    posts.append(post)
+
+        has_next = maybe_next and _select_one(tree, ".pageNav-page--later") is not None
+        return title, posts, has_next
+
+    @classmethod
+    def _extract_post(cls, post_elem) -> Optional[ForumPost]:
         """Extract a single post from HTML element."""
         try:
-            post_id = post_elem.get("data-content", "").replace("post-", "")
+            post_id = _attr(post_elem, "data-content").replace("post-", "")
 
-            author_elem = post_elem.select_one(".message-name")
-            author = author_elem.get_text(strip=True) if author_elem else "Unknown"
+            author_elem = _select_one(post_elem, ".message-name")
+            author = _text(author_elem) if author_elem else "Unknown"
 
-            date_elem = post_elem.select_one("time")
-            date_str = date_elem.get("datetime", "") if date_elem else ""
+            date_elem = _select_one(post_elem, "time")
+            date_str = _attr(date_elem, "datetime") if date_elem else ""
             date = datetime.fromisoformat(date_str.replace("Z", "+00:00")) if date_str else None
 
-            content_elem = post_elem.select_one(".message-body .bbWrapper")
-            content = content_elem.get_text(strip=True) if content_elem else ""
-            content = self._clean_content(content)
+            content_elem = _select_one(post_elem, ".message-body .bbWrapper")
+            content = _text(content_elem) if content_elem else ""
+            content = cls._clean_content(content)
 
-            if len(content) < self.MIN_POST_LENGTH:
+            if len(content) < cls.MIN_POST_LENGTH:
                 return None
 
-            likes_elem = post_elem.select_one(".reactionsBar-link")
+            likes_elem = _select_one(post_elem, ".reactionsBar-link")
             likes = 0
             if likes_elem:
-                likes_text = likes_elem.get_text(strip=True)
-                likes_match = re.search(r"(\d+)", likes_text)
-                likes = int(likes_match.group(1)) if likes_match else 0
+                likes_text = _text(likes_elem)
+                likes_match = _DIGITS_RE.search(likes_text)
+                likes = int(likes_match.group()) if likes_match else 0
 
             return ForumPost(
                 post_id=post_id,
@@ -416,10 +599,12 @@ class IH8MUDScraper(BaseScraper):
             logger.debug("Failed to extract post: %s", e)
             return None
 
-    def _clean_content(self, content: str) -> str:
+    @staticmethod
+    def _clean_content(content: str) -> str:
         """Clean post content."""
-        content = re.sub(r"\s+", " ", content)
-        content = re.sub(r"Click to expand\.\.\.", "", content)
+        content = _WHITESPACE_RE.sub(" ", content)
+        # Literal marker, so a plain replace beats another regex pass
+        content = content.replace("Click to expand...", "")
         return content.strip()
 
     def _thread_to_documents(
@@ -484,21 +669,15 @@ class IH8MUDScraper(BaseScraper):
         """Classify content into a ChromaDB category."""
         text_lower = text.lower()
 
-        categories = {
-            "engine": ["1fz", "engine", "head gasket", "timing", "oil", "coolant", "overheating"],
-            "drivetrain": ["birfield", "cv joint", "knuckle", "hub", "diff", "locker", "axle",
-                           "transmission", "a442f", "shift", "torque converter", "transfer case"],
-            "electrical": ["wiring", "ecu", "sensor", "relay", "fuse", "electrical", "alternator"],
-            "chassis": ["brake", "rotor", "pad", "caliper", "abs",
-                        "lift", "spring", "shock", "sway bar", "suspension",
-                        "steering", "power steering", "rack"],
-            "body": ["rust", "paint", "body", "door", "window"],
-            "forum_mods": ["lift kit", "bumper", "winch", "rack", "lights", "mod", "build",
-                           "install", "upgrade", "swap"],
-            "forum_maintenance": ["oil change", "maintenance", "service", "filter", "flush"],
-        }
+        if _CATEGORY_AUTOMATON is not None:
+            best = len(_CATEGORY_NAMES)
+            for _, groups in _CATEGORY_AUTOMATON.iter(text_lower):
+                best = min(best, groups[0])
+                if best == 0:
+                    break
+            return _CATEGORY_NAMES[best] if best < len(_CATEGORY_NAMES) else "forum_troubleshoot"
 
-        for category, keywords in categories.items():
+        for category, keywords in _CONTENT_CATEGORIES.items():
             if any(kw in text_lower for kw in keywords):
                 return category
 
@@ -506,22 +685,18 @@ class IH8MUDScraper(BaseScraper):
 
     def _extract_tags(self, text: str) -> list[str]:
         """Extract relevant tags from text."""
-        tags = []
         text_lower = text.lower()
 
-        tag_patterns = [
-            ("1fz-fe", ["1fz", "1fz-fe"]),
-            ("fzj80", ["fzj80", "80 series"]),
-            ("diy", ["how to", "step by step", "procedure"]),
-            ("troubleshooting", ["problem", "issue", "help", "won't"]),
-            ("parts", ["part number", "oem", "replace"]),
-        ]
+        if _TAG_AUTOMATON is not None:
+            hits: set[int] = set()
+            for _, groups in _TAG_AUTOMATON.iter(text_lower):
+                hits.update(groups)
+            return [_TAG_PATTERNS[i][0] for i in sorted(hits)]
 
-        for tag, patterns in tag_patterns:
-            if any(p in text_lower for p in patterns):
-                tags.append(tag)
-
-        return tags
+        return [
+            tag for tag, patterns in _TAG_PATTERNS
+            if any(p in text_lower for p in patterns)
+        ]
 
 
 async def run_scraper(
@@ -529,6 +704,7 @@ async def run_scraper(
     target_forum: str | None = None,
     index_only: bool = False,
     resume: bool = True,
+    request_slot: asyncio.Semaphore | None = None,
 ) -> Path:
     """Run the IH8MUD scraper and return output directory."""
     output_dir = Path("data/raw/forum")
@@ -538,10 +714,11 @@ async def run_scraper(
         target_forum=target_forum,
         index_only=index_only,
         resume=resume,
+        request_slot=request_slot,
     ) as scraper:
         count = 0
         async for doc in scraper.scrape():
-            scraper.save_document(doc)
+            await scraper.save_document(doc)
             count += 1
             if count % 10 == 0:
                 logger.info("Scraped %d documents", count)
@@ -73,9 +73,10 @@ class NHTSAScraper(BaseScraper):
 
     async def _fetch_json(self, url: str) -> dict | None:
         """Fetch NHTSA API endpoint, tolerating 400 (empty-result responses)."""
-        await self._rate_limit()
         try:
-            response = await self.client.get(url)
+            async with self.request_slot:
+                await self._rate_limit(url)
+                response = await self.client.get(url)
             # NHTSA returns 400 with valid JSON when there are 0 results
             if response.status_code in (200, 400):
                 return response.json()
@@ -109,10 +110,13 @@ class NHTSAScraper(BaseScraper):
         logger.info("  %s %d: %d results", data_type, year, len(results))
 
 
-async def run_scraper(years: list[int] | None = None) -> Path:
+async def run_scraper(
+    years: list[int] | None = None,
+    request_slot: asyncio.Semaphore | None = None,
+) -> Path:
     """Run the NHTSA scraper and return output directory."""
     output_dir = Path("data/raw/nhtsa")
-    async with NHTSAScraper(output_dir, years=years) as scraper:
+    async with NHTSAScraper(output_dir, years=years, request_slot=request_slot) as scraper:
         await scraper.scrape()
     return output_dir
 
@@ -182,10 +182,13 @@ class SORScraper(BaseScraper):
         return parts
 
 
-async def run_scraper(max_pages: int = 50) -> Path:
+async def run_scraper(
+    max_pages: int = 50,
+    request_slot: asyncio.Semaphore | None = None,
+) -> Path:
     """Run the SOR scraper and return output directory."""
     output_dir = Path("data/raw/sor")
-    async with SORScraper(output_dir, max_pages=max_pages) as scraper:
+    async with SORScraper(output_dir, max_pages=max_pages, request_slot=request_slot) as scraper:
         await scraper.scrape()
     return output_dir
 
@@ -18,10 +18,18 @@ Usage:
 
 from __future__ import annotations
 
+import json
 import sqlite3
 import logging
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
+from typing import Iterable
+
+try:
+    import orjson
+except ImportError:  # optional speedup for the legacy index import
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +48,30 @@ CREATE TABLE IF NOT EXISTS items (
     scraped_at    TEXT NOT NULL,
     PRIMARY KEY (scraper_name, item_id)
 );
+
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id     TEXT PRIMARY KEY,
+    title         TEXT NOT NULL,
+    url           TEXT NOT NULL,
+    replies       INTEGER NOT NULL DEFAULT 0,
+    views         INTEGER NOT NULL DEFAULT 0,
+    last_activity TEXT NOT NULL DEFAULT '',
+    forum         TEXT NOT NULL DEFAULT ''
+);
 """
 
+_THREAD_COLUMNS = ("thread_id", "title", "url", "replies", "views", "last_activity", "forum")
+# Stored for keys an entry lacks (or has as null); counts default to 0
+_THREAD_DEFAULTS = {col: 0 if col in ("replies", "views") else "" for col in _THREAD_COLUMNS}
+
+
+def _thread_row(thread: dict) -> tuple:
+    """Column values for one thread entry, with per-column defaults."""
+    return tuple(
+        _THREAD_DEFAULTS[col] if thread.get(col) is None else thread[col]
+        for col in _THREAD_COLUMNS
+    )
+
 
 class ScrapeStateManager:
     """SQLite-backed scrape checkpoint manager."""
@@ -51,6 +81,9 @@ class ScrapeStateManager:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(self.db_path))
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL crash-safe; mmap lets reads of the thread index skip read()
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=268435456")
         self._conn.executescript(_SCHEMA)
         self._conn.commit()
 
@@ -122,6 +155,56 @@ class ScrapeStateManager:
         ).fetchone()
         return row is not None
 
+    # ── thread index ──────────────────────────────────────────
+
+    def add_threads(self, threads: Iterable[dict]) -> None:
+        """Add listing-page thread entries; ids already indexed keep their first entry."""
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO threads ({', '.join(_THREAD_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_THREAD_COLUMNS))})",
+            map(_thread_row, threads),
+        )
+        self._conn.commit()
+
+    def import_thread_index(self, jsonl_path: str | Path, batch_size: int = 5000) -> int:
+        """Add a JSONL thread index (as written before the index moved here).
+
+        The file is streamed *batch_size* entries at a time; blank lines
+        are skipped.
+
+        Returns:
+            Number of entries read
+        """
+        loads = orjson.loads if orjson is not None else json.loads
+        count = 0
+        with open(jsonl_path, "rb") as f:
+            entries = (loads(line) for line in f if line.strip())
+            while batch := list(islice(entries, batch_size)):
+                self.add_threads(batch)
+                count += len(batch)
+        return count
+
+    def thread_count(self) -> int:
+        """Return the number of threads in the index."""
+        return self._conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+
+    def pending_threads(self, scraper_name: str) -> list[dict]:
+        """Return indexed threads not yet done for *scraper_name*, most engaged first.
+
+        Engagement is ``replies * 0.3 + views * 0.01``; ties keep index order.
+        """
+        rows = self._conn.execute(
+            f"""
+            SELECT {', '.join('t.' + col for col in _THREAD_COLUMNS)} FROM threads t
+            WHERE t.thread_id != '' AND NOT EXISTS (
+                SELECT 1 FROM items i WHERE i.scraper_name = ? AND i.item_id = t.thread_id
+            )
+            ORDER BY t.replies * 0.3 + t.views * 0.01 DESC, t.rowid
+            """,
+            (scraper_name,),
+        ).fetchall()
+        return [dict(zip(_THREAD_COLUMNS, row, strict=True)) for row in rows]
+
     # ── status helpers ────────────────────────────────────────
 
     def set_status(self, scraper_name: str, status: str) -> None:
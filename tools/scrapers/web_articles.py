@@ -177,10 +177,10 @@ class WebArticleScraper(BaseScraper):
             logger.info("  Saved %s (%d chars, %d sections)", slug, len(text), len(sections))
 
 
-async def run_scraper() -> Path:
+async def run_scraper(request_slot: asyncio.Semaphore | None = None) -> Path:
     """Run the web article scraper and return output directory."""
     output_dir = Path("data/raw/web")
-    async with WebArticleScraper(output_dir) as scraper:
+    async with WebArticleScraper(output_dir, request_slot=request_slot) as scraper:
         await scraper.scrape()
     return output_dir
 